@@ -0,0 +1,428 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Battle Simulator Module
+
+Runs many headless battles for every (class, level, enemy type, policy)
+combination and reports win rate, turns and HP remaining with 95%
+confidence intervals. Used to balance enemy stats.
+
+Usage:
+    python battle_simulator.py                         # 1000 battles per combination
+    python battle_simulator.py --battles 10000 --levels 1 5 10
+    python battle_simulator.py --output balance.csv    # or .json
+    python battle_simulator.py --engine numpy          # vectorized engine
+    python battle_simulator.py --engine exact          # solve instead of simulating
+"""
+
+import os
+import csv
+import json
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import combat_system
+import character_manager
+from custom_exceptions import CharacterDeadError
+
+# NumPy is optional; the vectorized engine is only available with it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+CLASSES = ("Warrior", "Mage", "Rogue", "Cleric")
+ENEMY_TYPES = ("goblin", "orc", "dragon")
+DEFAULT_LEVELS = (1, 3, 6)
+
+# Policy name -> factory taking a random.Random
+POLICIES = {
+    'greedy': lambda rng: combat_system.GreedyPolicy(),
+    'attack': lambda rng: combat_system.ScriptedPolicy([]),
+    'random': lambda rng: combat_system.RandomPolicy(rng=rng),
+}
+
+# Battles per task; large runs are split so every core gets work
+DEFAULT_CHUNK_SIZE = 500
+
+# z value for 95% confidence intervals
+Z_95 = 1.96
+
+# 'python' runs SimpleBattle; 'numpy' runs the vectorized batch engine;
+# 'exact' computes each row with combat_system.solve_battle()
+ENGINES = ("python", "numpy", "exact")
+
+# ============================================================================
+# SIMULATION
+# ============================================================================
+
+def simulate(battles=1000, classes=CLASSES, levels=DEFAULT_LEVELS, enemies=ENEMY_TYPES,
+             policies=tuple(POLICIES), seed=0, max_workers=None,
+             chunk_size=DEFAULT_CHUNK_SIZE, engine="python"):
+    """
+    Run 'battles' battles for every combination on a process pool
+
+    Each combination is split into chunks of at most chunk_size battles.
+    Battle i of combination (class, level, enemy, policy) draws every
+    roll from its own stream, combat_system.battle_rng(seed, class,
+    level, enemy, policy, i), so results are bit-for-bit the same for any
+    number of workers or chunk size, and a combination gets the same
+    results whatever else is in the grid. engine="numpy" resolves each
+    chunk with batch_battles() instead of one SimpleBattle per fight; its
+    chunks share one stream per chunk, keyed the same way by combination
+    and first battle, so its results depend on chunk_size (but not on
+    workers or the rest of the grid). Use a larger chunk_size with it.
+
+    engine="exact" skips simulation and solves each combination (see
+    exact_row).
+
+    Returns: List of row dictionaries, one per combination (see summarize)
+    Raises: ValueError for an unknown policy name or engine, or if
+            battles or chunk_size is less than 1
+            ImportError for engine="numpy" if NumPy is not installed
+    """
+    for policy in policies:
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}'")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'")
+    if battles < 1:
+        raise ValueError("battles must be at least 1")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if engine == "numpy" and numpy is None:
+        raise ImportError("NumPy is required for engine='numpy'")
+
+    combinations = [(character_class, level, enemy, policy)
+                    for character_class in classes for level in levels
+                    for enemy in enemies for policy in policies]
+
+    if engine == "exact":
+        return [exact_row(combination) for combination in combinations]
+
+    tasks = []
+    for index, combination in enumerate(combinations):
+        for start in range(0, battles, chunk_size):
+            count = min(chunk_size, battles - start)
+            tasks.append((index, combination, start, count, seed, engine))
+
+    totals = [None] * len(combinations)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for index, partial in pool.map(_run_chunk, tasks, chunksize=4):
+            totals[index] = partial if totals[index] is None else _merge(totals[index], partial)
+
+    return [summarize(combination, total) for combination, total in zip(combinations, totals)]
+
+
+def summarize(combination, totals):
+    """
+    Turn summed battle outcomes into one report row
+
+    Returns: {'class', 'level', 'enemy', 'policy', 'battles',
+              'win_rate', 'win_rate_low', 'win_rate_high', 'escape_rate',
+              'mean_turns', 'turns_ci', 'mean_hp_remaining', 'hp_ci'}
+              where *_ci is the half-width of the 95% interval
+    """
+    character_class, level, enemy, policy = combination
+    n = totals['battles']
+    win_low, win_high = wilson_interval(totals['wins'], n)
+    mean_turns, turns_ci = _mean_interval(totals['turns'], totals['turns_sq'], n)
+    mean_hp, hp_ci = _mean_interval(totals['hp'], totals['hp_sq'], n)
+
+    return {
+        'class': character_class,
+        'level': level,
+        'enemy': enemy,
+        'policy': policy,
+        'battles': n,
+        'win_rate': totals['wins'] / n,
+        'win_rate_low': win_low,
+        'win_rate_high': win_high,
+        'escape_rate': totals['escapes'] / n,
+        'mean_turns': mean_turns,
+        'turns_ci': turns_ci,
+        'mean_hp_remaining': mean_hp,
+        'hp_ci': hp_ci
+    }
+
+
+def exact_row(combination):
+    """
+    Build a report row from the exact outcome distribution
+
+    The row has the same keys as summarize(); 'battles' is None and every
+    confidence interval has zero width, except that probability the
+    solver left unresolved (beyond SOLVER_TOLERANCE) widens win_rate_high.
+    """
+    character_class, level, enemy_type, policy = combination
+    solution = combat_system.solve_battle(make_character(character_class, level),
+                                          combat_system.create_enemy(enemy_type), policy)
+    unresolved = solution['unresolved']
+    if unresolved <= combat_system.SOLVER_TOLERANCE:
+        unresolved = 0.0
+    return {
+        'class': character_class,
+        'level': level,
+        'enemy': enemy_type,
+        'policy': policy,
+        'battles': None,
+        'win_rate': solution['win'],
+        'win_rate_low': solution['win'],
+        'win_rate_high': solution['win'] + unresolved,
+        'escape_rate': solution['escape'],
+        'mean_turns': solution['expected_turns'],
+        'turns_ci': 0.0,
+        'mean_hp_remaining': solution['expected_hp'],
+        'hp_ci': 0.0
+    }
+
+
+def wilson_interval(successes, n, z=Z_95):
+    """Return the Wilson score interval (low, high) for a proportion"""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z * z / n
+    center = (p + z * z / (2 * n)) / denominator
+    spread = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denominator
+    # The interval always contains p (rounding can push it out at 0 or 1)
+    return max(min(center - spread, p), 0.0), min(max(center + spread, p), 1.0)
+
+
+def make_character(character_class, level):
+    """
+    Create a character of a class at a level
+
+    The character gains exactly the XP needed to reach the level, so its
+    stats follow the normal level-up rules.
+    """
+    character = character_manager.create_character(f"Sim{character_class}", character_class)
+    character_manager.gain_experience(character, 100 * level * (level - 1) // 2)
+    return character
+
+
+def _run_chunk(task):
+    """Run one chunk of battles for a combination (in a worker process)"""
+    index, combination, start, count, seed, engine = task
+    character_class, level, enemy_type, policy_name = combination
+
+    template = dict(make_character(character_class, level))
+    enemy_template = combat_system.create_enemy(enemy_type)
+
+    if engine == "numpy":
+        entropy = combat_system.battle_rng(seed, *combination, start).getrandbits(128)
+        result = batch_battles(template, enemy_template, policy_name, count,
+                               numpy.random.default_rng(entropy))
+        return index, _batch_totals(result)
+
+    totals = {'battles': count, 'wins': 0, 'escapes': 0,
+              'turns': 0, 'turns_sq': 0, 'hp': 0, 'hp_sq': 0}
+    for number in range(start, start + count):
+        rng = combat_system.battle_rng(seed, *combination, number)
+        character = dict(template)
+        battle = combat_system.SimpleBattle(
+            character, dict(enemy_template), policy=POLICIES[policy_name](rng),
+            quiet=True, rng=rng
+        )
+        result = battle.start_battle()
+
+        if result['winner'] == 'player':
+            totals['wins'] += 1
+        elif result['winner'] == 'escaped':
+            totals['escapes'] += 1
+        totals['turns'] += result['turns']
+        totals['turns_sq'] += result['turns'] ** 2
+        totals['hp'] += character['health']
+        totals['hp_sq'] += character['health'] ** 2
+
+    return index, totals
+
+
+def _merge(a, b):
+    return {key: a[key] + b[key] for key in a}
+
+
+def _mean_interval(total, total_sq, n):
+    """Return (mean, 95% half-width) from a sum and a sum of squares"""
+    mean = total / n
+    if n < 2:
+        return mean, 0.0
+    variance = max(total_sq - n * mean * mean, 0) / (n - 1)
+    return mean, Z_95 * math.sqrt(variance / n)
+
+# ============================================================================
+# VECTORIZED BATCH ENGINE
+# ============================================================================
+
+# Outcome codes in batch_battles() results
+ONGOING, PLAYER_WON, ENEMY_WON, ESCAPED = 0, 1, 2, 3
+
+# Action codes, in combat_system.ACTIONS order
+_ATTACK, _SPECIAL, _ESCAPE = 0, 1, 2
+
+CLERIC_HEAL = 30
+
+
+def batch_battles(character, enemy, policy="greedy", battles=1000, rng=None):
+    """
+    Fight 'battles' independent copies of one battle in lockstep
+
+    Character and enemy HP for every battle live in NumPy arrays. Each
+    turn applies the SimpleBattle rules to all unfinished battles at
+    once: the policy's action (basic attack with the calculate_damage
+    formula, the class special ability, or a 50% escape roll), then the
+    enemy's counterattack. Random rolls come from rng, a
+    numpy.random.Generator.
+
+    policy: 'attack', 'greedy' or 'random' (same choices as the
+    ScriptedPolicy([]), GreedyPolicy and RandomPolicy policies)
+
+    Returns: {'outcome': PLAYER_WON/ENEMY_WON/ESCAPED codes,
+              'turns': turns per battle, 'hp': character HP at the end}
+    Raises: ImportError if NumPy is not installed
+            CharacterDeadError if the character has no health
+            ValueError for an unknown policy
+    """
+    if numpy is None:
+        raise ImportError("NumPy is required for batch_battles")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'")
+    if character['health'] <= 0:
+        raise CharacterDeadError("Character is dead and cannot fight.")
+    rng = rng or numpy.random.default_rng()
+
+    character_class = character.get('class')
+    max_health = character['max_health']
+    strength = character['strength']
+    special_damage = {'Warrior': strength * 2, 'Mage': character['magic'] * 2}.get(character_class)
+
+    # Both sides' basic attacks are fixed for the whole battle
+    probe = combat_system.SimpleBattle(character, enemy, quiet=True)
+    attack = probe.calculate_damage(character, enemy)
+    counter = probe.calculate_damage(enemy, character)
+    special_is_better = combat_system.expected_special_damage(character) > attack
+
+    hp = numpy.full(battles, character['health'], dtype=numpy.int64)
+    enemy_hp = numpy.full(battles, enemy['health'], dtype=numpy.int64)
+    turns = numpy.zeros(battles, dtype=numpy.int64)
+    outcome = numpy.full(battles, ONGOING, dtype=numpy.int8)
+    live = numpy.arange(battles)
+
+    while live.size:
+        h = hp[live]
+        e = enemy_hp[live]
+        size = live.size
+        turns[live] += 1
+
+        # Player's action
+        if policy == 'attack':
+            action = numpy.full(size, _ATTACK)
+        elif policy == 'random':
+            action = rng.integers(0, 3, size)
+        elif character_class == "Cleric":
+            healed = numpy.minimum(h + CLERIC_HEAL, max_health)
+            heal = (attack < e) & (h <= counter) & (counter < healed)
+            action = numpy.where(heal, _SPECIAL, _ATTACK)
+        else:
+            special = (attack < e) & special_is_better
+            action = numpy.where(special, _SPECIAL, _ATTACK)
+
+        hit = numpy.zeros(size, dtype=numpy.int64)
+        hit[action == _ATTACK] = attack
+
+        special = action == _SPECIAL
+        if special_damage is not None:
+            hit[special] = special_damage
+        elif character_class == "Rogue":
+            crit = rng.random(int(special.sum())) < 0.5
+            hit[special] = numpy.where(crit, strength * 3, strength)
+        elif character_class == "Cleric":
+            h[special] = numpy.minimum(h[special] + CLERIC_HEAL, max_health)
+        e = numpy.maximum(e - hit, 0)
+
+        escaping = action == _ESCAPE
+        escaped = numpy.zeros(size, dtype=bool)
+        escaped[escaping] = rng.random(int(escaping.sum())) < 0.5
+
+        # Same order as SimpleBattle: enemy dead, then escape, then counterattack
+        won = e <= 0
+        ran = escaped & ~won
+        fighting = ~(won | ran)
+        h[fighting] = numpy.maximum(h[fighting] - counter, 0)
+        lost = fighting & (h <= 0)
+
+        hp[live] = h
+        enemy_hp[live] = e
+        outcome[live[won]] = PLAYER_WON
+        outcome[live[ran]] = ESCAPED
+        outcome[live[lost]] = ENEMY_WON
+        live = live[fighting & ~lost]
+
+    return {'outcome': outcome, 'turns': turns, 'hp': hp}
+
+
+def _batch_totals(result):
+    """Sum batch_battles() arrays into the totals summarize() expects"""
+    turns, hp = result['turns'], result['hp']
+    return {
+        'battles': int(turns.size),
+        'wins': int((result['outcome'] == PLAYER_WON).sum()),
+        'escapes': int((result['outcome'] == ESCAPED).sum()),
+        'turns': int(turns.sum()),
+        'turns_sq': int((turns * turns).sum()),
+        'hp': int(hp.sum()),
+        'hp_sq': int((hp * hp).sum())
+    }
+
+# ============================================================================
+# OUTPUT
+# ============================================================================
+
+def write_results(rows, output):
+    """Write result rows as CSV, or as JSON if output ends in .json"""
+    if output.endswith(".json"):
+        with open(output, 'w') as f:
+            json.dump(rows, f, indent=2)
+        return
+
+    with open(output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quest Chronicles battle simulator")
+    parser.add_argument("--battles", type=int, default=1000, help="battles per combination")
+    parser.add_argument("--classes", nargs="+", default=list(CLASSES))
+    parser.add_argument("--levels", type=int, nargs="+", default=list(DEFAULT_LEVELS))
+    parser.add_argument("--enemies", nargs="+", default=list(ENEMY_TYPES))
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="battle_results.csv")
+    parser.add_argument("--engine", default="python", choices=ENGINES)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = simulate(args.battles, args.classes, args.levels, args.enemies,
+                    args.policies, args.seed, args.workers, args.chunk_size, args.engine)
+    seconds = time.perf_counter() - start
+    write_results(rows, args.output)
+
+    for row in rows:
+        print(f"{row['class']:8} L{row['level']:<3} {row['enemy']:7} {row['policy']:7}"
+              f" win {row['win_rate']:6.1%} [{row['win_rate_low']:.1%}, {row['win_rate_high']:.1%}]"
+              f"  turns {row['mean_turns']:6.1f}  hp {row['mean_hp_remaining']:6.1f}")
+
+    if args.engine == "exact":
+        print(f"\nSolved {len(rows)} combinations in {seconds:.2f}s -> {args.output}")
+    else:
+        total = args.battles * len(rows)
+        print(f"\n{total:,} battles in {seconds:.2f}s ({total / seconds:,.0f}/s)"
+              f" on {args.workers} workers -> {args.output}")
@@ -0,0 +1,331 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmark Module
+
+Generates synthetic quest/item catalogs and measures how data loading
+scales with catalog size. Results are written as JSON so runs from
+different commits can be compared.
+
+Usage:
+    python benchmark.py                       # 1K, 100K and 1M records
+    python benchmark.py --sizes 1000 10000    # custom sizes
+    python benchmark.py --compare old.json    # show speedup vs an old run
+    python benchmark.py --saves 1000          # save/load throughput only
+    python benchmark.py --access 100000       # dict vs Character field access
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+import subprocess
+
+import game_data
+import quest_handler
+import combat_system
+import character_manager
+from inventory_system import parse_effect_string
+
+DEFAULT_SIZES = (1000, 100000, 1000000)
+EFFECT_STATS = ('strength', 'magic', 'health', 'max_health')
+ITEM_TYPES = ('weapon', 'armor', 'consumable')
+
+# ============================================================================
+# SYNTHETIC DATA GENERATION
+# ============================================================================
+
+def write_quest_file(filename, count, chain_length=10, seed=0):
+    """
+    Write a valid quest file with 'count' quests
+
+    Quests form prerequisite chains of up to chain_length quests; the
+    first quest of each chain has PREREQUISITE: NONE.
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w') as f:
+        for i in range(count):
+            prerequisite = "NONE" if i % chain_length == 0 else f"quest_{i - 1}"
+            f.write(
+                f"QUEST_ID: quest_{i}\n"
+                f"TITLE: Quest {i}\n"
+                f"DESCRIPTION: Synthetic quest number {i}\n"
+                f"REWARD_XP: {rng.randint(10, 500)}\n"
+                f"REWARD_GOLD: {rng.randint(5, 250)}\n"
+                f"REQUIRED_LEVEL: {1 + (i % chain_length)}\n"
+                f"PREREQUISITE: {prerequisite}\n"
+                "\n"
+            )
+
+
+def write_item_file(filename, count, max_effects=3, seed=0):
+    """
+    Write a valid item file with 'count' items
+
+    Each item gets between 1 and max_effects stat effects,
+    e.g. EFFECT: strength:4,health:12
+    """
+    rng = random.Random(seed)
+    with open(filename, 'w') as f:
+        for i in range(count):
+            stats = rng.sample(EFFECT_STATS, rng.randint(1, max_effects))
+            effect = ",".join(f"{stat}:{rng.randint(1, 30)}" for stat in stats)
+            f.write(
+                f"ITEM_ID: item_{i}\n"
+                f"NAME: Item {i}\n"
+                f"TYPE: {ITEM_TYPES[i % len(ITEM_TYPES)]}\n"
+                f"EFFECT: {effect}\n"
+                f"COST: {rng.randint(1, 1000)}\n"
+                f"DESCRIPTION: Synthetic item number {i}\n"
+                "\n"
+            )
+
+# ============================================================================
+# MEASUREMENT
+# ============================================================================
+
+def measure(function, records):
+    """
+    Run a function twice: once for time, once under tracemalloc for memory
+
+    Returns: Dictionary with seconds, records_per_sec and peak_bytes
+    """
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'seconds': seconds,
+        'records_per_sec': records / seconds if seconds else None,
+        'peak_bytes': peak
+    }
+
+
+def benchmark_size(size, directory):
+    """Generate catalogs of one size and benchmark every loader on them"""
+    quest_file = os.path.join(directory, f"quests_{size}.txt")
+    item_file = os.path.join(directory, f"items_{size}.txt")
+    write_quest_file(quest_file, size)
+    write_item_file(item_file, size)
+
+    quests = game_data.load_quests(quest_file)
+    effects = [item['effect'] for item in game_data.load_items(item_file).values()]
+
+    def parse_effects():
+        for effect in effects:
+            parse_effect_string(effect)
+
+    results = {
+        'load_quests': measure(lambda: game_data.load_quests(quest_file), size),
+        'load_items': measure(lambda: game_data.load_items(item_file), size),
+        'parse_effect_string': measure(parse_effects, size),
+        'validate_quest_prerequisites': measure(
+            lambda: quest_handler.validate_quest_prerequisites(quests), size
+        )
+    }
+
+    os.remove(quest_file)
+    os.remove(item_file)
+    return results
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, output="benchmark_results.json"):
+    """
+    Benchmark data loading at each size and write the results as JSON
+
+    Returns: The results dictionary that was written
+    """
+    results = {
+        'commit': _current_commit(),
+        'python': sys.version.split()[0],
+        'sizes': {}
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            results['sizes'][str(size)] = benchmark_size(size, directory)
+
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    return results
+
+
+def benchmark_save_formats(count=1000, directory=None):
+    """
+    Measure save and load throughput for the JSON and legacy save formats
+
+    Returns: {format: {'save_per_sec': float, 'load_per_sec': float}}
+    """
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"Bench{i}", "Warrior")
+        character['inventory'] = [f"item_{j}" for j in range(i % 20)]
+        character['completed_quests'] = [f"quest_{j}" for j in range(i % 10)]
+        characters.append(character)
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as save_directory:
+        for save_format in (character_manager.SAVE_FORMAT_JSON,
+                            character_manager.SAVE_FORMAT_LEGACY):
+            start = time.perf_counter()
+            for character in characters:
+                character_manager.save_character(character, save_directory, save_format)
+            save_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for character in characters:
+                character_manager.load_character(character['name'], save_directory)
+            load_seconds = time.perf_counter() - start
+
+            results[save_format] = {
+                'save_per_sec': count / save_seconds,
+                'load_per_sec': count / load_seconds
+            }
+
+    return results
+
+
+def benchmark_character_access(count=100000, battles=2000):
+    """
+    Measure field access and battle speed for dict and Character records
+
+    Each field benchmark reads (or writes) 'strength' and 'health' count
+    times through dict item access, Character item access and Character
+    attribute access. The battle benchmark fights quiet greedy battles
+    with a dict and with a Character as the player.
+
+    Returns: {'read_ns': {...}, 'write_ns': {...}, 'battles_per_sec': {...}},
+             each keyed by 'dict', 'character_item' (and 'character_attribute'
+             for reads and writes)
+    """
+    template = character_manager.create_character("Bench", "Warrior")
+    record = dict(template)
+    character = character_manager.Character(template)
+
+    def per_access(function, target):
+        start = time.perf_counter()
+        function(target)
+        return (time.perf_counter() - start) / (2 * count) * 1e9
+
+    def read_items(target):
+        for _ in range(count):
+            target['strength']
+            target['health']
+
+    def read_attributes(target):
+        for _ in range(count):
+            target.strength
+            target.health
+
+    def write_items(target):
+        for _ in range(count):
+            target['strength'] = 10
+            target['health'] = 50
+
+    def write_attributes(target):
+        for _ in range(count):
+            target.strength = 10
+            target.health = 50
+
+    results = {
+        'read_ns': {'dict': per_access(read_items, record),
+                    'character_item': per_access(read_items, character),
+                    'character_attribute': per_access(read_attributes, character)},
+        'write_ns': {'dict': per_access(write_items, record),
+                     'character_item': per_access(write_items, character),
+                     'character_attribute': per_access(write_attributes, character)},
+        'battles_per_sec': {}
+    }
+
+    for name, make in (('dict', lambda: dict(template)),
+                       ('character_item', lambda: character_manager.Character(template))):
+        players = [make() for _ in range(battles)]
+        rng = random.Random(0)
+        start = time.perf_counter()
+        for player in players:
+            combat_system.SimpleBattle(player, combat_system.create_enemy("dragon"),
+                                       policy=combat_system.GreedyPolicy(),
+                                       quiet=True, rng=rng).start_battle()
+        results['battles_per_sec'][name] = battles / (time.perf_counter() - start)
+
+    return results
+
+
+def compare_results(old, new):
+    """
+    Compare two result dictionaries
+
+    Returns: List of (size, benchmark, speedup) where speedup > 1 means
+             the new run is faster
+    """
+    rows = []
+    for size, benchmarks in new['sizes'].items():
+        for name, result in benchmarks.items():
+            old_result = old['sizes'].get(size, {}).get(name)
+            if old_result and result['seconds']:
+                rows.append((size, name, old_result['seconds'] / result['seconds']))
+    return rows
+
+
+def _current_commit():
+    """Return the current git commit hash, or None outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quest Chronicles data benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    parser.add_argument("--saves", type=int, metavar="COUNT",
+                        help="only benchmark save/load of COUNT characters")
+    parser.add_argument("--access", type=int, metavar="COUNT",
+                        help="only benchmark dict vs Character field access, COUNT times")
+    args = parser.parse_args()
+
+    if args.access:
+        results = benchmark_character_access(args.access)
+        for kind in ('read_ns', 'write_ns'):
+            for name, ns in results[kind].items():
+                print(f"{kind[:-3]:5} {name:20} {ns:8.1f} ns")
+        for name, rate in results['battles_per_sec'].items():
+            print(f"battle {name:19} {rate:>8,.0f}/s")
+        sys.exit(0)
+
+    if args.saves:
+        for save_format, result in benchmark_save_formats(args.saves).items():
+            print(f"{save_format:8} save {result['save_per_sec']:>10,.0f}/s"
+                  f"  load {result['load_per_sec']:>10,.0f}/s")
+        sys.exit(0)
+
+    results = run_benchmarks(args.sizes, args.output)
+
+    for size, benchmarks in results['sizes'].items():
+        print(f"\n{size} records:")
+        for name, result in benchmarks.items():
+            print(f"  {name:30} {result['records_per_sec']:>14,.0f} rec/s"
+                  f"  peak {result['peak_bytes'] / 1e6:8.1f} MB")
+
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print("\nSpeedup vs", args.compare)
+        for size, name, speedup in compare_results(old, results):
+            print(f"  {size:>8} {name:30} {speedup:6.2f}x")
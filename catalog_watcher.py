@@ -0,0 +1,183 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Catalog Watcher Module
+
+This module reloads quest and item data while the game is running.
+"""
+
+import os
+import threading
+
+import game_data
+import quest_handler
+from custom_exceptions import GameError
+
+# ============================================================================
+# CATALOG WATCHER
+# ============================================================================
+
+class CatalogWatcher:
+    """
+    Polls the quest and item files and hot-swaps new catalog versions
+
+    When a file's modification time or size changes, only the blocks
+    whose text changed are re-parsed. The block map behind that is built
+    on a file's first change, so creating a watcher parses nothing and
+    keeps a cached warm start cheap. Quest prerequisites are re-checked
+    for just the affected quests. If the new data is valid, on_reload is
+    called with complete new (quests, items) dictionaries, which the
+    caller swaps in with a single assignment. Invalid data is reported
+    through last_error, the current catalogs are kept, and both files
+    are checked again on the next poll.
+    """
+
+    def __init__(self, on_reload, quests, items,
+                 quest_file="data/quests.txt", item_file="data/items.txt",
+                 interval=1.0):
+        """Start watching from the catalogs that are already loaded"""
+        self.on_reload = on_reload
+        self.quests = quests
+        self.items = items
+        self.quest_file = quest_file
+        self.item_file = item_file
+        self.interval = interval
+        self.last_error = None
+
+        # Block text -> record maps, so a reload only parses changed blocks
+        # (None until the file first changes)
+        self._quest_blocks = None
+        self._item_blocks = None
+
+        self._signatures = {
+            quest_file: self._signature(quest_file),
+            item_file: self._signature(item_file)
+        }
+        self._stop = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _signature(filename):
+        """Return (mtime, size) for a file, or None if it is missing"""
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _reload(filename, kind, blocks, current):
+        """
+        Reload a file through its block map
+        
+        Without a block map yet, every block is parsed once, and records
+        equal to the loaded ones are replaced by those objects so callers
+        keep seeing unchanged records as the same objects.
+        
+        Returns: (records, blocks) as from game_data.reload_records
+        Raises: GameError subclasses from game_data.reload_records
+        """
+        if blocks is not None:
+            return game_data.reload_records(filename, kind, blocks)
+
+        records, blocks = game_data.reload_records(filename, kind)
+        for text, record in blocks.items():
+            record_id = record[record.FIELDS[0]]
+            loaded = current.get(record_id)
+            if loaded == record:
+                blocks[text] = records[record_id] = loaded
+        return records, blocks
+
+    def poll(self):
+        """
+        Check both files once and reload whichever changed
+
+        Returns: Dictionary describing the reload, or None if nothing changed
+                 {'changed_quests': [...], 'removed_quests': [...],
+                  'changed_items': [...], 'removed_items': [...]}
+        """
+        # New signatures are only remembered once the swap succeeded, so a
+        # failed reload is retried on the next poll
+        signatures = {
+            self.quest_file: self._signature(self.quest_file),
+            self.item_file: self._signature(self.item_file)
+        }
+        quests_changed = signatures[self.quest_file] != self._signatures.get(self.quest_file)
+        items_changed = signatures[self.item_file] != self._signatures.get(self.item_file)
+        if not quests_changed and not items_changed:
+            return None
+
+        quests, items = self.quests, self.items
+        report = {
+            'changed_quests': [], 'removed_quests': [],
+            'changed_items': [], 'removed_items': []
+        }
+
+        try:
+            if quests_changed:
+                quests, quest_blocks = self._reload(
+                    self.quest_file, 'Quest', self._quest_blocks, self.quests
+                )
+                changed, removed = _diff(self.quests, quests)
+
+                # Re-check changed quests and any quest that depended on a removed one
+                affected = set(changed)
+                if removed:
+                    removed_set = set(removed)
+                    affected.update(qid for qid, q in quests.items()
+                                    if q['prerequisite'] in removed_set)
+                quest_handler.validate_quest_prerequisites(quests, affected)
+
+                report['changed_quests'] = changed
+                report['removed_quests'] = removed
+
+            if items_changed:
+                items, item_blocks = self._reload(
+                    self.item_file, 'Item', self._item_blocks, self.items
+                )
+                report['changed_items'], report['removed_items'] = _diff(self.items, items)
+
+        except GameError as e:
+            # Keep serving the old catalogs until the files are fixed
+            self.last_error = e
+            return None
+
+        self.on_reload(quests, items)
+
+        if quests_changed:
+            self._quest_blocks = quest_blocks
+        if items_changed:
+            self._item_blocks = item_blocks
+        self._signatures.update(signatures)
+        self.last_error = None
+        self.quests, self.items = quests, items
+        return report
+
+    def start(self):
+        """Poll in a background daemon thread until stop() is called"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+
+def _diff(old, new):
+    """Return (changed_or_added_ids, removed_ids) between two catalogs"""
+    changed = []
+    for record_id, record in new.items():
+        old_record = old.get(record_id)
+        if old_record is not record and old_record != record:
+            changed.append(record_id)
+    removed = [record_id for record_id in old if record_id not in new]
+    return changed, removed
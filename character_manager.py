@@ -9,7 +9,23 @@ AI Usage: [Document any AI assistance used]
 This module handles character creation, loading, and saving.
 """
 
+import io
 import os
+import hashlib
+import ast
+import json
+import lzma
+import zlib
+import math
+import time
+import sqlite3
+import threading
+import itertools
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections.abc import Mapping, MutableMapping
+from symbols import SYMBOLS
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
@@ -18,6 +34,193 @@ from custom_exceptions import (
     CharacterDeadError
 )
 
+# First line of every versioned save file: "QCSAVE <version> <encoding>"
+SAVE_HEADER = "QCSAVE"
+SAVE_FORMAT_VERSION = 1
+
+SAVE_FORMAT_JSON = "json"
+SAVE_FORMAT_LEGACY = "legacy"
+
+# Fields that hold lists of item / quest IDs
+LIST_FIELDS = ("inventory", "active_quests", "completed_quests")
+
+# Journaled saves are folded into the snapshot after this many deltas
+JOURNAL_COMPACT_EVERY = 50
+
+# Per-directory index of saved characters used for fast listing
+MANIFEST_FILENAME = "manifest.jsonl"
+MANIFEST_SORT_KEYS = ("name", "class", "level", "modified")
+
+# Cold saves are moved into compressed packs in this subdirectory
+ARCHIVE_DIRNAME = "archive"
+ARCHIVE_INDEX_FILENAME = "index.json"
+ARCHIVE_AFTER_DAYS = 180
+
+# ============================================================================
+# CHARACTER RECORD
+# ============================================================================
+
+class Character(MutableMapping):
+    """
+    Slotted character record with dictionary-style access
+    
+    The fixed character fields live in __slots__, so a resident character
+    has no per-instance dict. Every existing character['field'] read and
+    write keeps working; keys that are not fixed fields (equipped_weapon,
+    extra stats, ...) go to the 'extra' dict.
+    
+    Item access goes through __getitem__/__setitem__ and costs several
+    times a dict lookup; attribute access (character.strength) is as fast
+    as a dict for plain fields, while health and max_health go through
+    their clamping properties. Code that fights many battles, such as
+    battle_simulator, works on plain dict copies (benchmark.py --access
+    measures the difference).
+    
+    Invariant: health never exceeds max_health. Raising health above it,
+    or lowering max_health below health, clamps health.
+    
+    A Character also remembers a fingerprint of each field from when it
+    was last saved or loaded (mark_clean), so dirty_fields() can tell a
+    save which fields actually need writing. Scalars are kept by
+    reference and lists by digest, so this costs no copy of the character.
+    """
+    FIELDS = (
+        "name", "class", "level", "health", "max_health",
+        "strength", "magic", "experience", "gold",
+        "inventory", "active_quests", "completed_quests"
+    )
+
+    # 'class' is a keyword, so that field is stored in 'character_class'
+    _SLOT_FOR = {field: "character_class" if field == "class" else field for field in FIELDS}
+
+    __slots__ = (
+        "name", "character_class", "level", "_health", "_max_health",
+        "strength", "magic", "experience", "gold",
+        "inventory", "active_quests", "completed_quests", "extra",
+        "_saved", "_saved_to"
+    )
+
+    def __init__(self, data=()):
+        self.extra = None
+        self._saved = None
+        self._saved_to = None
+        for key, value in dict(data).items():
+            self[key] = value
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a Character from a dictionary (or return it if it already is one)"""
+        if isinstance(data, cls):
+            return data
+        return cls(data)
+
+    @property
+    def health(self):
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        max_health = getattr(self, "_max_health", None)
+        if max_health is not None and value > max_health:
+            value = max_health
+        self._health = value
+
+    @property
+    def max_health(self):
+        return self._max_health
+
+    @max_health.setter
+    def max_health(self, value):
+        self._max_health = value
+        health = getattr(self, "_health", None)
+        if health is not None and health > value:
+            self._health = value
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._SLOT_FOR[key])
+        except KeyError:
+            if self.extra is not None and key in self.extra:
+                return self.extra[key]
+            raise
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            slot = self._SLOT_FOR[key]
+        except KeyError:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+        else:
+            setattr(self, slot, value)
+
+    def __delitem__(self, key):
+        slot = self._SLOT_FOR.get(key)
+        if slot is not None:
+            if slot in ("health", "max_health"):
+                slot = "_" + slot
+            try:
+                delattr(self, slot)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self):
+        for field, slot in self._SLOT_FOR.items():
+            if hasattr(self, slot):
+                yield field
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"Character({self.to_dict()!r})"
+
+    def to_dict(self):
+        """Return the character as a plain dictionary (values are not copied)"""
+        data = {}
+        for field, slot in self._SLOT_FOR.items():
+            try:
+                data[field] = getattr(self, slot)
+            except AttributeError:
+                pass
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def mark_clean(self, saved_to=None):
+        """Remember fingerprints of the current field values as the persisted state"""
+        self._saved = {key: _fingerprint(value) for key, value in self.items()}
+        self._saved_to = saved_to
+
+    def dirty_fields(self):
+        """
+        Compare the character with its persisted state
+        
+        Lists and other containers are compared by a digest of their
+        contents, so in-place changes such as inventory.append() are
+        detected too.
+        
+        Returns: (changed, deleted) lists of field names; every field is
+                 changed if the character was never saved or loaded
+        """
+        saved = self._saved
+        if saved is None:
+            return list(self), []
+
+        changed = [key for key, value in self.items()
+                   if key not in saved or saved[key] != _fingerprint(value)]
+        deleted = [key for key in saved if key not in self]
+        return changed, deleted
+
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -28,7 +231,7 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character (dictionary-style record) including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
@@ -51,8 +254,8 @@ def create_character(name, character_class):
     else:  # Cleric
         health, strength, magic = 100, 10, 15
 
-    # Return structured character data as a dictionary
-    return {
+    # Return structured character data as a Character record
+    return Character({
         "name": name,
         "class": character_class,
         "level": 1,
@@ -65,45 +268,42 @@ def create_character(name, character_class):
         "inventory": [],
         "active_quests": [],
         "completed_quests": []
-    }
+    })
 
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", save_format=SAVE_FORMAT_JSON,
+                   journal=False):
     """
     Save character to file
     
     Filename format: {character_name}_save.txt
     
-    File format:
-    NAME: character_name
-    CLASS: class_name
-    LEVEL: 1
-    HEALTH: 120
-    MAX_HEALTH: 120
-    STRENGTH: 15
-    MAGIC: 5
-    EXPERIENCE: 0
-    GOLD: 100
-    INVENTORY: item1,item2,item3
-    ACTIVE_QUESTS: quest1,quest2
-    COMPLETED_QUESTS: quest1,quest2
+    Default file format (versioned JSON):
+    QCSAVE 1 json
+    {"name": "character_name", "class": "Warrior", "level": 1, ...}
+    
+    save_format="legacy" writes the old 'key: value' text format:
+    name: character_name
+    class: class_name
+    level: 1
+    inventory: ['item1', 'item2']
+    
+    journal=True only appends the fields that changed since the last save
+    to {character_name}_save.journal, and folds the journal back into the
+    snapshot every JOURNAL_COMPACT_EVERY saves.
+    
+    A Character that has not changed since it was last saved to (or
+    loaded from) the same place is not written at all; see save_stats().
+    
+    save_directory may also be a SQLite database path (*.db / *.sqlite)
+    or a StorageBackend object; see get_backend(). SQLite saves are
+    always JSON and cannot be journaled, so other options return False.
     
     Returns: True if successful
     Raises: PermissionError, IOError (let them propagate or handle)
     """
-    import os
-
-    # Create save directory if it doesn’t exist
-    os.makedirs(save_directory, exist_ok=True)
-
-    # Build the file path for the specific character
-    file_path = os.path.join(save_directory, f"{character['name']}_save.txt")
-
     try:
-        # Write each key-value pair into the save file
-        with open(file_path, "w") as f:
-            for key, value in character.items():
-                f.write(f"{key}: {value}\n")
+        _save(character, get_backend(save_directory), save_format, journal)
         return True
 
     except Exception as e:
@@ -115,101 +315,1424 @@ def load_character(character_name, save_directory="data/save_games"):
     """
     Load character from save file
     
+    Reads both the versioned JSON format and the legacy text format.
+    
     Args:
         character_name: Name of character to load
-        save_directory: Directory containing save files
+        save_directory: Directory containing save files (or a backend)
     
-    Returns: Character dictionary
+    Returns: Character record
     Raises: 
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """ 
-    import os
+    backend = get_backend(save_directory)
+    character = Character.from_dict(backend.load(character_name))
 
-    # Find the save file for this character
-    file_path = os.path.join(save_directory, f"{character_name}_save.txt")
+    # Share one copy of each item/quest ID across characters
+    for field in LIST_FIELDS:
+        if isinstance(character.get(field), list):
+            SYMBOLS.intern_list(character[field])
 
-    # If missing, raise custom "not found" error
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+    # What was just read is what is stored, so an unchanged save is skipped
+    destination = _destination(backend, character_name)
+    if destination is not None:
+        token = _save_tokens.setdefault(destination, next(_save_counter))
+        character.mark_clean((destination, token, SAVE_FORMAT_JSON))
+
+    return character
+
+
+def list_saved_characters(save_directory="data/save_games"):
+    """
+    Get list of all saved character names, including archived ones
+    
+    Returns: List of character names (without _save.txt extension)
+    """
+    return get_backend(save_directory).list_names()
+
+
+def list_characters(save_directory="data/save_games", sort_by="name", reverse=False,
+                    offset=0, limit=None):
+    """
+    Get a sorted page of saved characters with their class and level
+    
+    sort_by: 'name', 'class', 'level' or 'modified'
+    
+    Returns: List of {'name', 'class', 'level', 'modified'} dictionaries
+    Raises: ValueError for an unknown sort_by
+    """
+    if sort_by not in MANIFEST_SORT_KEYS:
+        raise ValueError(f"Cannot sort characters by '{sort_by}'")
+    return get_backend(save_directory).list_entries(sort_by, reverse, offset, limit)
+
+
+def delete_character(character_name, save_directory="data/save_games"):
+    """
+    Delete a character's save file
+    
+    Returns: True if deleted successfully
+    Raises: CharacterNotFoundError if character doesn't exist
+    """
+    backend = get_backend(save_directory)
+    deleted = backend.delete(character_name)
+
+    # Characters saved before the delete must be written again
+    _save_tokens.pop(_destination(backend, character_name), None)
+    return deleted
+
+
+# Default number of threads used by the bulk load/save functions
+BULK_IO_WORKERS = 8
+
+
+def load_characters(character_names, save_directory="data/save_games", max_workers=BULK_IO_WORKERS):
+    """
+    Load many characters using a bounded thread pool
+    
+    A failure for one character does not stop the others.
+    
+    Returns: (characters, errors) where characters is {name: character}
+             and errors is {name: exception}, e.g. CharacterNotFoundError
+             or SaveFileCorruptedError
+    """
+    return _run_bulk(
+        lambda name: load_character(name, save_directory),
+        list(character_names), list(character_names), max_workers
+    )
+
+
+def save_characters(characters, save_directory="data/save_games", max_workers=BULK_IO_WORKERS):
+    """
+    Save many characters using a bounded thread pool
+    
+    Backends with batch_saves (SQLite) get one save_many() call instead,
+    which writes the whole batch in a single transaction.
+    
+    Returns: (saved, errors) where saved is {name: True} and errors is
+             {name: exception} for every character that could not be saved
+    """
+    characters = list(characters)
+    backend = get_backend(save_directory)
+    if backend.batch_saves:
+        return _save_batch(characters, backend)
+
+    def save_one(character):
+        _save(character, backend)
+        return True
+
+    return _run_bulk(
+        save_one, characters, [character['name'] for character in characters], max_workers
+    )
+
+
+def _run_bulk(function, arguments, names, max_workers):
+    """Run function over arguments on a thread pool, collecting results and errors by name"""
+    results = {}
+    errors = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(function, argument): name for argument, name in zip(arguments, names)}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                errors[name] = e
+
+    return results, errors
+
+
+# ============================================================================
+# DELTA SAVES
+# ============================================================================
+
+# A Character remembers (destination, token, save_format) from its last
+# save or load. A destination is one character's save in one backend,
+# whatever format it was written in, and every write to it gets a new
+# token, so a character only counts as clean if nothing else was saved
+# over it since. Loads record the default JSON format, so saving a loaded
+# character in the legacy format always writes. This assumes no other
+# process writes the same saves, like the save journal does.
+_save_tokens = {}
+_save_counter = itertools.count(1)
+
+_save_stats_lock = threading.Lock()
+_save_stats = {'saves': 0, 'skipped': 0, 'bytes_written': 0, 'last_save_bytes': 0}
+
+
+def save_stats():
+    """
+    Return save counters for monitoring
+    
+    Returns: {'saves', 'skipped', 'bytes_written', 'last_save_bytes',
+              'bytes_per_save'}; skipped saves count as saves of 0 bytes
+    """
+    with _save_stats_lock:
+        stats = dict(_save_stats)
+    stats['bytes_per_save'] = stats['bytes_written'] / stats['saves'] if stats['saves'] else 0.0
+    return stats
 
-    character = {}
 
+def reset_save_stats():
+    """Set all save counters back to zero"""
+    with _save_stats_lock:
+        for key in _save_stats:
+            _save_stats[key] = 0
+
+
+def _save(character, backend, save_format=SAVE_FORMAT_JSON, journal=False):
+    """
+    Save a character through a backend, writing only what changed
+    
+    Unchanged Characters are skipped; for changed ones the backend gets
+    the changed field names, which the journal writes as a small delta.
+    
+    Returns: Number of bytes written (0 if skipped)
+    """
+    delta = _delta(character, backend, save_format)
+    if delta is not None and not delta[0] and not delta[1]:
+        _record_save(0, skipped=True)
+        return 0
+
+    written = backend.save(character, save_format=save_format, journal=journal, delta=delta)
+    _record_save(written)
+    _mark_saved(character, backend, save_format)
+    return written
+
+
+def _save_batch(characters, backend):
+    """
+    Save characters with a single backend.save_many() call
+    
+    Unchanged Characters are skipped as in _save(). If the batch fails,
+    every character in it is reported with that error.
+    
+    Returns: (saved, errors) like save_characters()
+    """
+    saved = {}
+    pending = []
+    for character in characters:
+        delta = _delta(character, backend, SAVE_FORMAT_JSON)
+        if delta is not None and not delta[0] and not delta[1]:
+            _record_save(0, skipped=True)
+            saved[character['name']] = True
+        else:
+            pending.append(character)
+
+    if not pending:
+        return saved, {}
+    try:
+        written = backend.save_many(pending)
+    except Exception as e:
+        return saved, {character['name']: e for character in pending}
+
+    for character, size in zip(pending, written):
+        _record_save(size)
+        _mark_saved(character, backend, SAVE_FORMAT_JSON)
+        saved[character['name']] = True
+    return saved, {}
+
+
+def _delta(character, backend, save_format):
+    """
+    Return what changed since a Character was last saved to the same place
+    
+    Returns: (changed, deleted) field names, or None if unknown (not a
+             Character, never saved here, or saved over since)
+    """
+    if not isinstance(character, Character):
+        return None
+    destination = _destination(backend, character['name'])
+    if destination is None:
+        return None
+    if character._saved_to != (destination, _save_tokens.get(destination), save_format):
+        return None
+    return character.dirty_fields()
+
+
+def _mark_saved(character, backend, save_format):
+    """Give a destination a new token after a write and mark the character clean"""
+    destination = _destination(backend, character['name'])
+    if destination is None:
+        return
+    token = next(_save_counter)
+    _save_tokens[destination] = token
+    if isinstance(character, Character):
+        character.mark_clean((destination, token, save_format))
+
+
+def _destination(backend, character_name):
+    """Return the key identifying where a character is saved, or None"""
+    location = backend.location
+    if location is None:
+        return None
+    return (location, character_name)
+
+
+def _record_save(written, skipped=False):
+    with _save_stats_lock:
+        _save_stats['saves'] += 1
+        _save_stats['skipped'] += skipped
+        _save_stats['bytes_written'] += written
+        _save_stats['last_save_bytes'] = written
+
+
+def _fingerprint(value):
+    """
+    Return a small stand-in for a field value to compare it later
+    
+    Immutable scalars become (type, value), so 1 and True differ.
+    Anything else becomes its type and the SHA-256 digest of its JSON
+    encoding (or of its repr if it cannot be encoded), so in-place
+    changes are seen without keeping a copy of the value.
+    """
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return (type(value), value)
     try:
-        # Read all lines from the file
-        with open(file_path, "r") as f:
-            lines = f.readlines()
+        data = json.dumps(value, separators=(",", ":"), default=_json_default)
+    except (TypeError, ValueError):
+        data = repr(value)
+    return (type(value), hashlib.sha256(data.encode()).digest())
+
+
+# ============================================================================
+# STORAGE BACKENDS
+# ============================================================================
+
+# SQLite backends are shared so each database is only opened once
+_sqlite_backends = {}
+
+
+def get_backend(save_directory="data/save_games"):
+    """
+    Pick the storage backend for a save_directory argument
+    
+    - a StorageBackend object is used as-is
+    - a path ending in .db / .sqlite / .sqlite3 selects SQLiteBackend
+    - anything else is a directory of flat save files
+    
+    Returns: StorageBackend
+    """
+    if isinstance(save_directory, StorageBackend):
+        return save_directory
+
+    if _is_sqlite_path(save_directory):
+        path = os.path.abspath(save_directory)
+        if path not in _sqlite_backends:
+            _sqlite_backends[path] = SQLiteBackend(path)
+        return _sqlite_backends[path]
+
+    return FlatFileBackend(save_directory)
+
+
+def _is_sqlite_path(save_directory):
+    return str(save_directory).endswith((".db", ".sqlite", ".sqlite3"))
+
+
+def _flat_directory(save_directory):
+    """
+    Return the directory behind a save_directory argument that must hold
+    flat save files (for journals, the manifest and archives)
+    
+    Raises: ValueError for a SQLite path or any other kind of backend
+    """
+    if isinstance(save_directory, FlatFileBackend):
+        return save_directory.save_directory
+    if isinstance(save_directory, StorageBackend) or _is_sqlite_path(save_directory):
+        raise ValueError(f"'{save_directory}' does not store flat save files")
+    return save_directory
+
 
-        # Process each line individually
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue  # Skip blank lines
+class StorageBackend(ABC):
+    """
+    Interface every character storage backend implements
+    
+    save() returns the number of bytes written and may use delta, a
+    (changed, deleted) pair of field names or None if unknown. load()
+    returns a character dictionary and raises CharacterNotFoundError /
+    SaveFileCorruptedError, list_names() returns character names and
+    delete() raises CharacterNotFoundError. location identifies the
+    storage (None disables skipping unchanged saves).
+    """
+    location = None
+
+    # True if save_characters() should send bulk saves through one
+    # save_many() call instead of a thread pool
+    batch_saves = False
+
+    @abstractmethod
+    def save(self, character, save_format=SAVE_FORMAT_JSON, journal=False, delta=None):
+        raise NotImplementedError
+
+    def save_many(self, characters):
+        """
+        Save several characters; backends may batch this
+        
+        Returns: List with the number of bytes written for each character
+        """
+        return [self.save(character) for character in characters]
+
+    @abstractmethod
+    def load(self, character_name):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_names(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def list_entries(self, sort_by="name", reverse=False, offset=0, limit=None):
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, character_name):
+        raise NotImplementedError
+
+
+class FlatFileBackend(StorageBackend):
+    """One {name}_save.txt file per character in a directory"""
+
+    def __init__(self, save_directory="data/save_games"):
+        self.save_directory = save_directory
+        self.location = os.path.abspath(save_directory)
+
+    def _path(self, character_name):
+        return os.path.join(self.save_directory, f"{character_name}_save.txt")
+
+    def save(self, character, save_format=SAVE_FORMAT_JSON, journal=False, delta=None):
+        # Create save directory if it doesn’t exist
+        os.makedirs(self.save_directory, exist_ok=True)
+
+        # Build the file path for the specific character
+        file_path = self._path(character['name'])
+
+        if journal:
+            written = _save_journaled(character, self.save_directory, file_path, delta)
+        else:
+            if save_format == SAVE_FORMAT_LEGACY:
+                data = encode_legacy_save(character)
+            else:
+                data = encode_save(character)
+
+            with open(file_path, "w") as f:
+                f.write(data)
+            written = len(data.encode())
+
+            # A full save replaces any journal written before it
+            _discard_journal(file_path)
+
+        _update_manifest(self.save_directory, character['name'], _manifest_entry(character))
+        return written
+
+    def load(self, character_name):
+        # Find the save file for this character
+        file_path = self._path(character_name)
+
+        # If missing, it may be archived; otherwise raise custom "not found" error
+        if not os.path.exists(file_path):
+            entry = _archive_entry(self.save_directory, character_name)
+            if entry is None:
+                raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+            return _load_archived(self.save_directory, character_name, entry)
+
+        try:
+            with open(file_path, "r") as f:
+                character = decode_save(f)
 
-            # Ensure the line has a key/value structure
-            if ": " not in line:
-                raise SaveFileCorruptedError(f"Malformed line in save file: {line}")
+            # Replay journaled changes made after the snapshot
+            _replay_journal(character, _journal_path(file_path))
 
-            key, value = line.split(": ", 1)
+        except InvalidSaveDataError:
+            raise
 
-            # Convert numeric strings back into integers
-            if value.isdigit():
-                value = int(value)
+        except Exception as e:
+            # Wrap any error into a "corrupted save file" exception
+            raise SaveFileCorruptedError(
+                f"Could not read save file for '{character_name}'"
+            ) from e
 
-            # Convert list strings back into Python lists
-            elif value.startswith("[") and value.endswith("]"):
-                value = eval(value)
+        return character
+
+    def list_names(self):
+        if not os.path.exists(self.save_directory):
+            return []
+
+        # The manifest answers without scanning the directory
+        entries = read_manifest(self.save_directory)
+        if entries is not None:
+            return list(entries)
+
+        result = []
+
+        # Loop over all files and extract character names
+        for filename in os.listdir(self.save_directory):
+            if filename.endswith("_save.txt"):
+                result.append(filename[:-9])  # remove "_save.txt"
+
+        live = set(result)
+        result.extend(name for name in _archive_index(self.save_directory) if name not in live)
+        return result
+
+    def delete(self, character_name):
+        # Build file path
+        file_path = self._path(character_name)
+
+        archived = _archive_entry(self.save_directory, character_name) is not None
+
+        # If neither a file nor an archived copy exists, raise an error
+        if not os.path.exists(file_path) and not archived:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+
+        # Delete the file (and any journal) and confirm success
+        if os.path.exists(file_path):
+            os.remove(file_path)
+            _discard_journal(file_path)
+        if archived:
+            _remove_archived(self.save_directory, character_name)
+        _update_manifest(self.save_directory, character_name, None)
+        return True
+
+    def list_entries(self, sort_by="name", reverse=False, offset=0, limit=None):
+        if not os.path.exists(self.save_directory):
+            return []
 
-            character[key] = value
+        entries = read_manifest(self.save_directory)
+        if entries is None:
+            entries = rebuild_manifest(self.save_directory)
+
+        rows = [dict(entry, name=name) for name, entry in entries.items()]
+
+        # Missing values (unreadable saves) sort last
+        blank = "" if sort_by in ("name", "class") else 0
+        rows.sort(key=lambda row: (row[sort_by] is None,
+                                   blank if row[sort_by] is None else row[sort_by]),
+                  reverse=reverse)
+        end = None if limit is None else offset + limit
+        return rows[offset:end]
+
+
+class SQLiteBackend(StorageBackend):
+    """
+    All characters in one SQLite database
+    
+    Uses WAL mode so readers do not block the writer, a primary-key index
+    on name for lookups, parameterized statements (cached by sqlite3) and
+    one transaction for save_many(). Each thread gets its own connection.
+    
+    Characters are always stored as JSON rows: save() raises ValueError
+    for save_format="legacy" or journal=True instead of ignoring them.
+    """
+    batch_saves = True
+
+    def __init__(self, path):
+        self.path = path
+        self.location = os.path.abspath(path)
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connection() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS characters ("
+                " name TEXT PRIMARY KEY,"
+                " class TEXT,"
+                " level INTEGER,"
+                " data TEXT NOT NULL,"
+                " updated REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+            # Indexes for sorted, paginated listing
+            db.execute("CREATE INDEX IF NOT EXISTS characters_level ON characters(level)")
+            db.execute("CREATE INDEX IF NOT EXISTS characters_updated ON characters(updated)")
+
+    def _connection(self):
+        """Return this thread's connection, opening it on first use"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def _row(character):
+        body = json.dumps(character, separators=(",", ":"), default=_json_default)
+        return (character['name'], character.get('class'), character.get('level'),
+                body, time.time())
+
+    def save(self, character, save_format=SAVE_FORMAT_JSON, journal=False, delta=None):
+        if save_format != SAVE_FORMAT_JSON:
+            raise ValueError(f"SQLite saves cannot use the '{save_format}' save format")
+        if journal:
+            raise ValueError("SQLite saves cannot be journaled")
+        row = self._row(character)
+        with self._connection() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO characters (name, class, level, data, updated)"
+                " VALUES (?, ?, ?, ?, ?)",
+                row
+            )
+        return len(row[3].encode())
+
+    def save_many(self, characters):
+        # One transaction for the whole batch
+        rows = [self._row(character) for character in characters]
+        with self._connection() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO characters (name, class, level, data, updated)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+        return [len(row[3].encode()) for row in rows]
+
+    def load(self, character_name):
+        row = self._connection().execute(
+            "SELECT data FROM characters WHERE name = ?", (character_name,)
+        ).fetchone()
+
+        if row is None:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+
+        try:
+            character = json.loads(row[0])
+        except ValueError as e:
+            raise SaveFileCorruptedError(
+                f"Could not read save data for '{character_name}'"
+            ) from e
 
         return character
 
+    def list_names(self):
+        rows = self._connection().execute("SELECT name FROM characters ORDER BY name")
+        return [name for (name,) in rows]
+
+    def list_entries(self, sort_by="name", reverse=False, offset=0, limit=None):
+        # Column names come from a fixed table, never from the caller
+        column = {"name": "name", "class": "class",
+                  "level": "level", "modified": "updated"}[sort_by]
+        direction = "DESC" if reverse else "ASC"
+        rows = self._connection().execute(
+            f"SELECT name, class, level, updated FROM characters"
+            f" ORDER BY {column} {direction}, name LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset)
+        )
+        return [{'name': name, 'class': character_class, 'level': level, 'modified': updated}
+                for name, character_class, level, updated in rows]
+
+    def delete(self, character_name):
+        with self._connection() as db:
+            cursor = db.execute("DELETE FROM characters WHERE name = ?", (character_name,))
+
+        if cursor.rowcount == 0:
+            raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
+        return True
+
+    def close(self):
+        """Close this thread's connection"""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+class CharacterCache:
+    """
+    Write-back LRU cache of loaded characters
+    
+    get() serves characters from memory and only calls load_character on
+    a miss. Characters are changed in place by the usual functions
+    (gain_experience, add_gold, inventory and quest functions), and each
+    cached Character tracks its own changes since it was last loaded or
+    saved (Character.dirty_fields), so the cache keeps no copy of it.
+    Only dirty characters are written, on eviction or flush().
+    
+    Limits: max_characters entries and, optionally, max_bytes of
+    serialized character data. An entry's size is measured once when it
+    is added and updated from the bytes each write-back saves. The least
+    recently used entry is evicted first.
+    """
+
+    def __init__(self, save_directory="data/save_games", max_characters=1000, max_bytes=None):
+        self.save_directory = save_directory
+        self.max_characters = max_characters
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # name -> {'character', 'bytes', 'dirty'}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writes = 0
+        self.skipped_writes = 0
+
+    def get(self, character_name):
+        """
+        Return a cached character, loading it on a miss
+        
+        Raises: CharacterNotFoundError, SaveFileCorruptedError
+        """
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(character_name)
+                return entry['character']
+
+            self.misses += 1
+            character = load_character(character_name, self.save_directory)
+            self._insert(character, dirty=False)
+            return character
+
+    def put(self, character):
+        """
+        Add (or replace) a character; it is written on the next flush
+        
+        A plain dictionary is converted to a Character first, so change
+        the returned object rather than the dictionary afterwards.
+        
+        Returns: The cached Character
+        """
+        character = Character.from_dict(character)
+        with self._lock:
+            self._remove(character['name'])
+            self._insert(character, dirty=True)
+        return character
+
+    def mark_dirty(self, character_name):
+        """
+        Have a cached character saved on the next flush
+        
+        The save itself is still skipped if the character matches what
+        was last written (see save_stats()).
+        """
+        with self._lock:
+            if character_name in self._entries:
+                self._entries[character_name]['dirty'] = True
+
+    def is_dirty(self, character_name):
+        """Return True if a cached character changed since it was last written"""
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is None:
+                return False
+            return entry['dirty'] or _has_changes(entry['character'])
+
+    def flush(self):
+        """
+        Write every dirty character
+        
+        Returns: Number of characters written
+        """
+        with self._lock:
+            return sum(1 for name in list(self._entries) if self._write_back(name))
+
+    def stats(self):
+        """Return hit/miss, eviction and write counters plus current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'writes': self.writes,
+                'skipped_writes': self.skipped_writes,
+                'characters': len(self._entries),
+                'bytes': self._bytes
+            }
+
+    def __contains__(self, character_name):
+        return character_name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _insert(self, character, dirty):
+        size = len(encode_save(character).encode()) if self.max_bytes is not None else 0
+        self._entries[character['name']] = {
+            'character': character, 'bytes': size, 'dirty': dirty
+        }
+        self._bytes += size
+        self._evict()
+
+    def _remove(self, character_name):
+        entry = self._entries.pop(character_name, None)
+        if entry is not None:
+            self._bytes -= entry['bytes']
+        return entry
+
+    def _evict(self):
+        """Evict least recently used entries until within both limits"""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_characters
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            name = next(iter(self._entries))
+            self._write_back(name)
+            self._remove(name)
+            self.evictions += 1
+
+    def _write_back(self, character_name):
+        """Save one entry if it is dirty; return True if anything was written"""
+        entry = self._entries[character_name]
+        if not entry['dirty'] and not _has_changes(entry['character']):
+            self.skipped_writes += 1
+            return False
+
+        try:
+            written = _save(entry['character'], get_backend(self.save_directory))
+        except Exception as e:
+            raise IOError(f"Could not save character '{character_name}'") from e
+        entry['dirty'] = False
+
+        # _save skips characters that match what was last written
+        if not written:
+            self.skipped_writes += 1
+            return False
+
+        if self.max_bytes is not None:
+            self._bytes += written - entry['bytes']
+            entry['bytes'] = written
+        self.writes += 1
+        return True
+
+
+def _has_changes(character):
+    """Return True if a Character has fields that changed since it was saved"""
+    changed, deleted = character.dirty_fields()
+    return bool(changed or deleted)
+
+
+# ============================================================================
+# SAVE DIRECTORY MANIFEST
+# ============================================================================
+
+# The manifest is an append-only JSON-lines file: each line either sets
+# one character's entry or marks it deleted. It is rewritten compactly
+# when it grows well past the number of characters it describes.
+
+_manifest_lock = threading.Lock()
+
+# Parsed manifests: {directory: {'entries': {...}, 'lines': int, 'stamp': ...}}
+_manifest_cache = {}
+
+
+def read_manifest(save_directory="data/save_games"):
+    """
+    Read the manifest of a save directory
+    
+    Returns: {name: {'class', 'level', 'modified'}}, or None if the
+             directory has no manifest yet
+    Raises: ValueError if save_directory is a SQLite database or another
+            backend without save files
+    """
+    save_directory = _flat_directory(save_directory)
+    with _manifest_lock:
+        state = _load_manifest(save_directory)
+        return None if state is None else dict(state['entries'])
+
+
+def rebuild_manifest(save_directory="data/save_games"):
+    """
+    Rebuild a save directory's manifest from the save files themselves
+    
+    Use this to repair the manifest after save files were copied in or
+    removed by hand. Saves that cannot be read are listed without class
+    and level.
+    
+    Returns: The rebuilt {name: entry} dictionary
+    Raises: ValueError if save_directory is a SQLite database or another
+            backend without save files
+    """
+    save_directory = _flat_directory(save_directory)
+    backend = FlatFileBackend(save_directory)
+    entries = {}
+
+    for filename in os.listdir(save_directory):
+        if not filename.endswith("_save.txt"):
+            continue
+        name = filename[:-9]
+        modified = os.path.getmtime(os.path.join(save_directory, filename))
+
+        try:
+            entries[name] = _manifest_entry(backend.load(name), modified)
+        except (SaveFileCorruptedError, InvalidSaveDataError):
+            entries[name] = {'class': None, 'level': None, 'modified': modified}
+
+    # Archived characters are listed from the archive index
+    for name, entry in _archive_index(save_directory).items():
+        if name not in entries:
+            entries[name] = {'class': entry['class'], 'level': entry['level'],
+                             'modified': entry['modified']}
+
+    with _manifest_lock:
+        _write_manifest(save_directory, entries)
+
+    return entries
+
+
+def _manifest_entry(character, modified=None):
+    """Build the manifest entry for a character"""
+    return {
+        'class': character.get('class'),
+        'level': character.get('level'),
+        'modified': time.time() if modified is None else modified
+    }
+
+
+def _manifest_path(save_directory):
+    return os.path.join(save_directory, MANIFEST_FILENAME)
+
+
+def _file_stamp(path):
+    """Return (mtime, size) of a file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_manifest(save_directory):
+    """Return the cached manifest state, re-reading the file if it changed"""
+    path = _manifest_path(save_directory)
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return None
+
+    state = _manifest_cache.get(save_directory)
+    if state is not None and state['stamp'] == stamp:
+        return state
+
+    entries = {}
+    lines = 0
+    with open(path, "r") as f:
+        for line in f:
+            # A last line without a newline was cut off mid-write; skip it
+            if not line.endswith("\n"):
+                break
+            record = json.loads(line)
+            lines += 1
+            if record.get('deleted'):
+                entries.pop(record['name'], None)
+            else:
+                entries[record.pop('name')] = record
+
+    state = {'entries': entries, 'lines': lines, 'stamp': stamp}
+    _manifest_cache[save_directory] = state
+    return state
+
+
+def _write_manifest(save_directory, entries):
+    """Write a compact manifest (one line per character) atomically"""
+    path = _manifest_path(save_directory)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        for name, entry in entries.items():
+            f.write(json.dumps(dict(entry, name=name), separators=(",", ":")) + "\n")
+    os.replace(temp_path, path)
+
+    _manifest_cache[save_directory] = {
+        'entries': dict(entries), 'lines': len(entries), 'stamp': _file_stamp(path)
+    }
+
+
+def _update_manifest(save_directory, name, entry):
+    """Record a saved (entry) or deleted (entry=None) character"""
+    with _manifest_lock:
+        state = _load_manifest(save_directory)
+
+    # First manifest for an existing directory: index what is already there
+    if state is None:
+        rebuild_manifest(save_directory)
+
+    with _manifest_lock:
+        state = _load_manifest(save_directory)
+        record = {'name': name, 'deleted': True} if entry is None else dict(entry, name=name)
+
+        with open(_manifest_path(save_directory), "a") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+        if entry is None:
+            state['entries'].pop(name, None)
+        else:
+            state['entries'][name] = entry
+        state['lines'] += 1
+        state['stamp'] = _file_stamp(_manifest_path(save_directory))
+
+        # Compact once stale lines outnumber live entries
+        if state['lines'] > 2 * len(state['entries']) + 64:
+            _write_manifest(save_directory, state['entries'])
+
+
+# ============================================================================
+# SAVE ARCHIVE
+# ============================================================================
+
+# Saves not modified for a while are compressed one by one and appended
+# to a pack file in {save_directory}/archive/. index.json maps each
+# archived name to {'pack', 'offset', 'length', 'codec', 'class',
+# 'level', 'modified'}. A live {name}_save.txt always wins over the
+# archived copy, so saving an archived character simply brings it back.
+
+ARCHIVE_CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 9), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+_archive_lock = threading.Lock()
+
+# Parsed indexes: {directory: {'index': {...}, 'stamp': ...}}
+_archive_cache = {}
+
+
+def archive_characters(save_directory="data/save_games", days=ARCHIVE_AFTER_DAYS,
+                       codec="lzma", now=None):
+    """
+    Compress saves not modified for 'days' days into a new pack file
+    
+    Each save (with its journal folded in) is compressed separately so
+    one character can be read back without unpacking the others. The
+    original files are removed once the pack and index are written.
+    Run this while the game is not saving into the same directory.
+    
+    Returns: {'archived', 'original_bytes', 'archived_bytes',
+              'reclaimed_bytes', 'pack'}
+    Raises: ValueError for an unknown codec, or if save_directory is a
+            SQLite database or another backend without save files
+    """
+    save_directory = _flat_directory(save_directory)
+    if codec not in ARCHIVE_CODECS:
+        raise ValueError(f"Unknown archive codec '{codec}'")
+    compress = ARCHIVE_CODECS[codec][0]
+    cutoff = (time.time() if now is None else now) - days * 86400
+
+    stats = {'archived': 0, 'original_bytes': 0, 'archived_bytes': 0,
+             'reclaimed_bytes': 0, 'pack': None}
+    if not os.path.isdir(save_directory):
+        return stats
+
+    backend = FlatFileBackend(save_directory)
+    candidates = []
+    for filename in sorted(os.listdir(save_directory)):
+        if not filename.endswith("_save.txt"):
+            continue
+        file_path = os.path.join(save_directory, filename)
+        paths = [path for path in (file_path, _journal_path(file_path)) if os.path.exists(path)]
+        modified = max(os.path.getmtime(path) for path in paths)
+        if modified < cutoff:
+            candidates.append((filename[:-9], paths, modified))
+
+    if not candidates:
+        return stats
+
+    archive_directory = os.path.join(save_directory, ARCHIVE_DIRNAME)
+    os.makedirs(archive_directory, exist_ok=True)
+    pack = _new_pack_name(archive_directory)
+    archived = []
+
+    with _archive_lock:
+        index = dict(_load_archive_index(save_directory))
+
+        with open(os.path.join(archive_directory, pack), "wb") as f:
+            for name, paths, modified in candidates:
+                try:
+                    character = backend.load(name)
+                except (SaveFileCorruptedError, InvalidSaveDataError):
+                    # Leave unreadable saves where they are
+                    continue
+
+                data = compress(encode_save(character).encode())
+                index[name] = {
+                    'pack': pack, 'offset': f.tell(), 'length': len(data), 'codec': codec,
+                    'class': character.get('class'), 'level': character.get('level'),
+                    'modified': modified
+                }
+                f.write(data)
+
+                stats['original_bytes'] += sum(os.path.getsize(path) for path in paths)
+                stats['archived_bytes'] += len(data)
+                archived.append(paths[0])
+
+        if not archived:
+            os.remove(os.path.join(archive_directory, pack))
+            return stats
+
+        _write_archive_index(save_directory, index)
+
+    # Only now that the index points at the pack are the originals removed
+    for file_path in archived:
+        os.remove(file_path)
+        _discard_journal(file_path)
+    _remove_unused_packs(save_directory)
+
+    stats['archived'] = len(archived)
+    stats['reclaimed_bytes'] = stats['original_bytes'] - stats['archived_bytes']
+    stats['pack'] = pack
+    return stats
+
+
+def measure_cold_loads(save_directory="data/save_games", names=None):
+    """
+    Time load_character for archived characters
+    
+    Returns: {'count', 'mean_ms', 'max_ms'}
+    Raises: ValueError if save_directory is a SQLite database or another
+            backend without save files
+    """
+    save_directory = _flat_directory(save_directory)
+    if names is None:
+        names = [name for name in _archive_index(save_directory)
+                 if not os.path.exists(os.path.join(save_directory, f"{name}_save.txt"))]
+
+    timings = []
+    for name in names:
+        start = time.perf_counter()
+        load_character(name, save_directory)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'count': len(timings),
+        'mean_ms': sum(timings) / len(timings) if timings else 0.0,
+        'max_ms': max(timings, default=0.0)
+    }
+
+
+def _archive_path(save_directory, filename):
+    return os.path.join(save_directory, ARCHIVE_DIRNAME, filename)
+
+
+def _archive_index(save_directory):
+    """Return a copy of the archive index ({} if nothing is archived)"""
+    with _archive_lock:
+        return dict(_load_archive_index(save_directory))
+
+
+def _archive_entry(save_directory, character_name):
+    """Return the archive index entry for a character, or None"""
+    with _archive_lock:
+        return _load_archive_index(save_directory).get(character_name)
+
+
+def _load_archive_index(save_directory):
+    """Return the cached archive index, re-reading the file if it changed"""
+    path = _archive_path(save_directory, ARCHIVE_INDEX_FILENAME)
+    stamp = _file_stamp(path)
+    if stamp is None:
+        return {}
+
+    state = _archive_cache.get(save_directory)
+    if state is None or state['stamp'] != stamp:
+        with open(path, "r") as f:
+            state = {'index': json.load(f), 'stamp': stamp}
+        _archive_cache[save_directory] = state
+    return state['index']
+
+
+def _write_archive_index(save_directory, index):
+    """Write the archive index atomically"""
+    path = _archive_path(save_directory, ARCHIVE_INDEX_FILENAME)
+    temp_path = path + ".tmp"
+    with open(temp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(temp_path, path)
+    _archive_cache[save_directory] = {'index': dict(index), 'stamp': _file_stamp(path)}
+
+
+def _load_archived(save_directory, character_name, entry):
+    """Read and decompress one archived character"""
+    try:
+        with open(_archive_path(save_directory, entry['pack']), "rb") as f:
+            f.seek(entry['offset'])
+            data = f.read(entry['length'])
+        text = ARCHIVE_CODECS[entry['codec']][1](data).decode()
+        return decode_save(io.StringIO(text))
+
+    except InvalidSaveDataError:
+        raise
+
     except Exception as e:
-        # Wrap any error into a "corrupted save file" exception
         raise SaveFileCorruptedError(
-            f"Could not read save file for '{character_name}'"
+            f"Could not read archived save for '{character_name}'"
         ) from e
 
 
-def list_saved_characters(save_directory="data/save_games"):
+def _remove_archived(save_directory, character_name):
+    """Drop a character from the archive index"""
+    with _archive_lock:
+        index = dict(_load_archive_index(save_directory))
+        if index.pop(character_name, None) is not None:
+            _write_archive_index(save_directory, index)
+    _remove_unused_packs(save_directory)
+
+
+def _remove_unused_packs(save_directory):
+    """Delete pack files that no index entry points into"""
+    with _archive_lock:
+        used = {entry['pack'] for entry in _load_archive_index(save_directory).values()}
+        archive_directory = os.path.join(save_directory, ARCHIVE_DIRNAME)
+        for filename in os.listdir(archive_directory):
+            if filename.endswith(".pack") and filename not in used:
+                os.remove(os.path.join(archive_directory, filename))
+
+
+def _new_pack_name(archive_directory):
+    """Return an unused pack file name based on the current time"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    for number in itertools.count():
+        filename = f"saves-{stamp}-{number}.pack"
+        if not os.path.exists(os.path.join(archive_directory, filename)):
+            return filename
+
+
+# ============================================================================
+# SAVE FILE CODEC
+# ============================================================================
+
+def encode_save(character):
     """
-    Get list of all saved character names
+    Encode a character in the versioned JSON save format
     
-    Returns: List of character names (without _save.txt extension)
+    Returns: Save file contents as a string
     """
-    if not os.path.exists(save_directory):
-        return []
+    body = json.dumps(character, separators=(",", ":"), default=_json_default)
+    return f"{SAVE_HEADER} {SAVE_FORMAT_VERSION} {SAVE_FORMAT_JSON}\n{body}\n"
 
-    result = []
 
-    # Loop over all files and extract character names
-    for filename in os.listdir(save_directory):
-        if filename.endswith("_save.txt"):
-            result.append(filename[:-9])  # remove "_save.txt"
+def encode_legacy_save(character):
+    """
+    Encode a character in the legacy 'key: value' text format
+    
+    Returns: Save file contents as a string
+    """
+    return "".join(f"{key}: {value}\n" for key, value in character.items())
 
-    return result
 
+def decode_save(file):
+    """
+    Decode a save file from an open text file
+    
+    The first line decides the format: a QCSAVE header means the versioned
+    format, anything else is read line by line as the legacy format.
+    
+    Returns: Character dictionary
+    Raises: InvalidSaveDataError for an unknown version or encoding
+            SaveFileCorruptedError for unreadable contents
+    """
+    first_line = file.readline()
 
+    if not first_line.startswith(SAVE_HEADER + " "):
+        return _decode_legacy_lines(first_line, file)
 
-def delete_character(character_name, save_directory="data/save_games"):
+    parts = first_line.split()
+    if len(parts) != 3 or parts[1] != str(SAVE_FORMAT_VERSION) or parts[2] != SAVE_FORMAT_JSON:
+        raise InvalidSaveDataError(f"Unsupported save format: {first_line.strip()}")
+
+    character = json.loads(file.read())
+    if not isinstance(character, dict):
+        raise SaveFileCorruptedError("Save file does not contain a character.")
+    return character
+
+
+def _decode_legacy_lines(first_line, file):
+    """Parse the legacy 'key: value' format one line at a time"""
+    character = {}
+
+    for line in _chain_first(first_line, file):
+        line = line.strip()
+        if not line:
+            continue  # Skip blank lines
+
+        # "key:" with nothing after it is an empty value
+        key, separator, value = line.partition(":")
+        if not separator:
+            raise SaveFileCorruptedError(f"Malformed line in save file: {line}")
+
+        key = key.strip().lower()
+        character[key] = _decode_legacy_value(key, value.strip())
+
+    return character
+
+
+def _chain_first(first_line, file):
+    """Yield an already-read first line, then the rest of the file"""
+    if first_line:
+        yield first_line
+    yield from file
+
+
+def _decode_legacy_value(key, value):
+    """Turn one legacy text value back into an int, list or string"""
+    # Convert numeric strings back into integers
+    if value.lstrip("-").isdigit():
+        return int(value)
+
+    # Convert list strings back into Python lists (literals only, never code)
+    if value.startswith("[") and value.endswith("]"):
+        return list(ast.literal_eval(value))
+
+    # Empty or comma-separated list fields
+    if key in LIST_FIELDS:
+        return [part.strip() for part in value.split(",") if part.strip()]
+
+    return value
+
+
+def _json_default(value):
+    """Let json encode mappings such as loaded Item records"""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Cannot save value of type {type(value).__name__}")
+
+
+# ============================================================================
+# SAVE JOURNAL
+# ============================================================================
+
+# Last persisted state of journaled characters in this process:
+# {save_file_path: {'fields': {...}, 'entries': journal_line_count}}
+_journal_state = {}
+
+
+def compact_journal(character_name, save_directory="data/save_games"):
     """
-    Delete a character's save file
+    Fold a character's journal into its snapshot and remove the journal
     
-    Returns: True if deleted successfully
-    Raises: CharacterNotFoundError if character doesn't exist
+    Returns: True if compacted
+    Raises: CharacterNotFoundError, SaveFileCorruptedError
+            ValueError if save_directory is a SQLite database or another
+            backend without save files (they keep no journal)
     """
-    # Build file path
+    save_directory = _flat_directory(save_directory)
     file_path = os.path.join(save_directory, f"{character_name}_save.txt")
+    character = load_character(character_name, save_directory)
+    _write_snapshot(file_path, character)
+    _discard_journal(file_path)
+    _journal_state[file_path] = {'fields': _plain_copy(character), 'entries': 0}
+    return True
 
-    # If file doesn't exist, raise an error
-    if not os.path.exists(file_path):
-        raise CharacterNotFoundError(f"Character '{character_name}' does not exist.")
 
-    # Delete the file and confirm success
-    os.remove(file_path)
-    return True
+def _journal_path(file_path):
+    """Return the journal path that belongs to a save file"""
+    return file_path[:-len(".txt")] + ".journal"
+
+
+def _plain_copy(character):
+    """Return a JSON-normalized deep copy of a character"""
+    return json.loads(json.dumps(character, default=_json_default))
+
+
+def _write_snapshot(file_path, character):
+    """Write a full save atomically (temporary file, then rename); return bytes written"""
+    data = encode_save(character)
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w") as f:
+        f.write(data)
+    os.replace(temp_path, file_path)
+    return len(data.encode())
+
+
+def _discard_journal(file_path):
+    """Remove a save's journal and forget its in-memory state"""
+    _journal_state.pop(file_path, None)
+    journal_path = _journal_path(file_path)
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+
+
+def _save_journaled(character, save_directory, file_path, delta=None):
+    """
+    Append the changed fields of a character to its save journal
+    
+    delta is a (changed, deleted) pair of field names when the caller
+    already knows them; otherwise the character is compared with the
+    last saved state.
+    
+    Returns: Number of bytes written
+    """
+    journal_path = _journal_path(file_path)
+    state = _journal_state.get(file_path)
+
+    # First journaled save in this process: find out what is on disk
+    if state is None:
+        if not os.path.exists(file_path):
+            written = _write_snapshot(file_path, character)
+            _journal_state[file_path] = {'fields': _plain_copy(character), 'entries': 0}
+            return written
+
+        entries = 0
+        if os.path.exists(journal_path):
+            with open(journal_path, "r") as f:
+                entries = sum(1 for _ in f)
+        # The saved fields are only read back if a diff is needed
+        state = {'fields': None, 'entries': entries}
+        _journal_state[file_path] = state
+
+    if delta is not None:
+        changed, deleted = delta
+        record = _plain_copy({key: character[key] for key in changed})
+        if state['fields'] is not None:
+            state['fields'].update(record)
+            for key in deleted:
+                state['fields'].pop(key, None)
+    else:
+        if state['fields'] is None:
+            state['fields'] = _plain_copy(load_character(character['name'], save_directory))
+        current = _plain_copy(character)
+        previous = state['fields']
+        record = {
+            key: value for key, value in current.items()
+            if key not in previous or previous[key] != value
+        }
+        deleted = [key for key in previous if key not in current]
+        state['fields'] = current
+
+    # Nothing changed since the last save
+    if not record and not deleted:
+        return 0
+
+    if deleted:
+        record["__deleted__"] = list(deleted)
+
+    # Append first, so the journal always ends at the newest values
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with open(journal_path, "a") as f:
+        f.write(line)
+    written = len(line.encode())
+    state['entries'] += 1
+
+    if state['entries'] >= JOURNAL_COMPACT_EVERY:
+        written += _write_snapshot(file_path, character)
+        os.remove(journal_path)
+        state['entries'] = 0
+
+    return written
+
+
+def _replay_journal(character, journal_path):
+    """Apply journaled field changes to a loaded snapshot, in order"""
+    if not os.path.exists(journal_path):
+        return
 
+    with open(journal_path, "r") as f:
+        for line in f:
+            # A last line without a newline was cut off mid-write; skip it
+            if not line.endswith("\n"):
+                break
+
+            delta = json.loads(line)
+            for key in delta.pop("__deleted__", []):
+                character.pop(key, None)
+            character.update(delta)
 
 
 # ============================================================================
@@ -228,6 +1751,11 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    Going from level L to level K costs 100 * (L + ... + K-1) XP, which is
+    50 * (K*(K-1) - L*(L-1)), so the final level is found directly instead
+    of looping once per level gained.
+    
+    Returns: Number of levels gained
     Raises: CharacterDeadError if character health is 0
     """
     if character['health'] <= 0:
@@ -235,19 +1763,69 @@ def gain_experience(character, xp_amount):
 
     character['experience'] += xp_amount
 
-    # Loop in case multiple level-ups happen at once
-    while character['experience'] >= character['level'] * 100:
-        character['experience'] -= character['level'] * 100
-        character['level'] += 1
+    level = character['level']
+    experience = character['experience']
+    new_level = _final_level(level, experience)
+    levels_gained = new_level - level
+
+    if levels_gained > 0:
+        character['experience'] = experience - 50 * (new_level * (new_level - 1) - level * (level - 1))
+        character['level'] = new_level
 
-        # Increase stats each level
-        character['max_health'] += 10
-        character['strength'] += 2
-        character['magic'] += 2
+        # Increase stats for every level gained
+        character['max_health'] += 10 * levels_gained
+        character['strength'] += 2 * levels_gained
+        character['magic'] += 2 * levels_gained
 
         # Restore full health on level up
         character['health'] = character['max_health']
 
+    return levels_gained
+
+
+def gain_experience_batch(awards):
+    """
+    Apply XP awards to many characters at once
+    
+    Args:
+        awards: Iterable of (character, xp_amount) pairs
+    
+    Every character is checked before any award is applied, so a dead
+    character leaves the whole batch untouched.
+    
+    Returns: List with the number of levels each character gained
+    Raises: CharacterDeadError if any character's health is 0
+    """
+    awards = list(awards)
+
+    for character, _ in awards:
+        if character['health'] <= 0:
+            raise CharacterDeadError(
+                f"Cannot gain experience: {character.get('name', 'character')} is dead."
+            )
+
+    return [gain_experience(character, xp_amount) for character, xp_amount in awards]
+
+
+def _final_level(level, experience):
+    """
+    Return the level reached from 'level' with 'experience' XP banked
+    
+    Largest K with K*(K-1) <= L*(L-1) + experience // 50, never below L.
+    Unusual values (non-integer XP, negative XP or level below 1) use the
+    original step-by-step rule so the result is always identical to it.
+    """
+    if not isinstance(experience, int) or not isinstance(level, int) or experience < 0 or level < 1:
+        while experience >= level * 100:
+            experience -= level * 100
+            level += 1
+        return level
+
+    limit = level * (level - 1) + experience // 50
+    new_level = (1 + math.isqrt(1 + 4 * limit)) // 2
+    return max(new_level, level)
+
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -366,6 +1944,33 @@ def validate_character_data(character):
 # ============================================================================
 
 if __name__ == "__main__":
+    import sys
+
+    # python -m character_manager repair [save_directory]
+    if len(sys.argv) > 1 and sys.argv[1] == "repair":
+        directory = sys.argv[2] if len(sys.argv) > 2 else "data/save_games"
+        entries = rebuild_manifest(directory)
+        print(f"Rebuilt manifest for {len(entries)} characters in {directory}")
+        sys.exit(0)
+
+    # python -m character_manager archive [save_directory] [days] [zlib|lzma]
+    if len(sys.argv) > 1 and sys.argv[1] == "archive":
+        directory = sys.argv[2] if len(sys.argv) > 2 else "data/save_games"
+        days = float(sys.argv[3]) if len(sys.argv) > 3 else ARCHIVE_AFTER_DAYS
+        codec = sys.argv[4] if len(sys.argv) > 4 else "lzma"
+
+        stats = archive_characters(directory, days, codec)
+        print(f"Archived {stats['archived']} characters"
+              + (f" into {stats['pack']}" if stats['pack'] else ""))
+        print(f"Reclaimed {stats['reclaimed_bytes']:,} bytes"
+              f" ({stats['original_bytes']:,} -> {stats['archived_bytes']:,})")
+
+        latency = measure_cold_loads(directory)
+        if latency['count']:
+            print(f"Cold load: mean {latency['mean_ms']:.2f} ms, max {latency['max_ms']:.2f} ms"
+                  f" over {latency['count']} archived characters")
+        sys.exit(0)
+
     print("=== CHARACTER MANAGER TEST ===")
     
     # Test character creation
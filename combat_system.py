@@ -9,6 +9,8 @@ AI Usage: [Document any AI assistance used]
 Handles combat mechanics
 """
 
+import hashlib
+from abc import ABC, abstractmethod
 from random import random
 from custom_exceptions import (
     InvalidTargetError,
@@ -94,13 +96,27 @@ class SimpleBattle:
     """
     Simple turn-based combat system
     
-    Manages combat between character and enemy
+    Manages combat between character and enemy. The player's actions come
+    from a BattlePolicy (HumanPolicy, reading input(), by default);
+    quiet=True turns off all printing so battles can be run headless.
+    Every random roll (escape, critical strike, random policy) is drawn
+    from rng, e.g. a stream from battle_rng(); by default the global
+    random module is used.
+    
+    start_battle() fights with a plain dict copy of a character that is
+    not a dict (such as a character_manager.Character, whose item access
+    is several times slower) and writes changed fields back when the
+    battle ends, so policies see that copy as battle.character.
     """
     
-    def __init__(self, character, enemy):
+    def __init__(self, character, enemy, policy=None, quiet=False, rng=None):
         """Initialize battle with character and enemy"""
+        import random
         self.character = character
         self.enemy = enemy
+        self.policy = HumanPolicy() if policy is None else policy
+        self.quiet = quiet
+        self.rng = random if rng is None else rng
         self.combat_active = True
         self.turn_counter = 0
     
@@ -109,15 +125,36 @@ class SimpleBattle:
         Start the combat loop
         
         Returns: Dictionary with battle results:
-                {'winner': 'player'|'enemy', 'xp_gained': int, 'gold_gained': int}
+                {'winner': 'player'|'enemy'|'escaped', 'xp_gained': int,
+                 'gold_gained': int, 'turns': int}
         
         Raises: CharacterDeadError if character is already dead
         """
        # Award XP and gold if player wins
         if self.character['health'] <= 0:
             raise CharacterDeadError("Character is dead and cannot fight.")
+
+        character = self.character
+        if type(character) is dict:
+            return self._fight()
+
+        # Item access on dict-like records is slow, so fight with a dict
+        to_dict = getattr(character, "to_dict", None)
+        before = to_dict() if to_dict is not None else dict(character)
+        self.character = dict(before)
+        try:
+            return self._fight()
+        finally:
+            for key, value in self.character.items():
+                if before.get(key) is not value:
+                    character[key] = value
+            self.character = character
+
+    def _fight(self):
         while self.combat_active:
-            display_combat_stats(self.character, self.enemy)
+            self.turn_counter += 1
+            if not self.quiet:
+                display_combat_stats(self.character, self.enemy)
 
             # Player chooses an action
             self.player_turn()
@@ -125,49 +162,50 @@ class SimpleBattle:
             if self.enemy['health'] <= 0:
                 xp = self.enemy['xp_reward']
                 gold = self.enemy['gold_reward']
-                display_battle_log(f"You defeated the {self.enemy['name']}! Gained {xp} XP and {gold} gold.")
+                self.log(f"You defeated the {self.enemy['name']}! Gained {xp} XP and {gold} gold.")
                 self.combat_active = False
-                return {'winner': 'player', 'xp_gained': xp, 'gold_gained': gold}
+                return self._result('player', xp, gold)
+
+            # Player ran away
+            if not self.combat_active:
+                return self._result('escaped', 0, 0)
 
             # Enemy takes a turn
             self.enemy_turn()
             # Check if player died
             if self.character['health'] <= 0:
-                display_battle_log("You have been defeated!")
+                self.log("You have been defeated!")
                 self.combat_active = False
-                return {'winner': 'enemy', 'xp_gained': 0, 'gold_gained': 0}
+                return self._result('enemy', 0, 0)
+
     def player_turn(self):
         """
         Handle player's turn
         
-        Displays options:
-        1. Basic Attack
-        2. Special Ability (if available)
-        3. Try to Run
+        Asks the policy for one of:
+        1. Basic Attack (ATTACK)
+        2. Special Ability (SPECIAL)
+        3. Try to Run (ESCAPE)
         
         Raises: CombatNotActiveError if called outside of battle
         """
         if self.combat_active == False:
             raise CombatNotActiveError("Cannot take turn, combat is not active.")
-        print("\nYour turn! Choose an action:")
-        print("1. Basic Attack")
-        print("2. Special Ability")
-        print("3. Try to Run")
-        choice = input("Enter the number of your choice: ")
-        if choice == '1':
+        action = self.policy.choose_action(self)
+        if action == ATTACK:
             damage = self.calculate_damage(self.character, self.enemy)
             self.apply_damage(self.enemy, damage)
-            display_battle_log(f"You attack the {self.enemy['name']} for {damage} damage!")
-        elif choice == '2':
-            result = use_special_ability(self.character, self.enemy)
-            display_battle_log(result)
-        elif choice == '3':
+            self.log(f"You attack the {self.enemy['name']} for {damage} damage!")
+        elif action == SPECIAL:
+            result = use_special_ability(self.character, self.enemy, self.rng)
+            self.log(result)
+        elif action == ESCAPE:
             escaped = self.attempt_escape()
             if escaped:
-                display_battle_log("You successfully escaped the battle!")
+                self.log("You successfully escaped the battle!")
             else:
-                display_battle_log("Escape failed! The battle continues.")
-        else:
+                self.log("Escape failed! The battle continues.")
+        elif not self.quiet:
             print("Invalid choice. Please select a valid action.")
     def enemy_turn(self):
         """
@@ -181,8 +219,16 @@ class SimpleBattle:
             raise CombatNotActiveError("Cannot take turn, combat is not active.")
         damage = self.calculate_damage(self.enemy, self.character)
         self.apply_damage(self.character, damage)
-        display_battle_log(f"The {self.enemy['name']} attacks you for {damage} damage!")
+        self.log(f"The {self.enemy['name']} attacks you for {damage} damage!")
+
+    def log(self, message):
+        """Show a battle message unless the battle is quiet"""
+        if not self.quiet:
+            display_battle_log(message)
 
+    def _result(self, winner, xp, gold):
+        return {'winner': winner, 'xp_gained': xp, 'gold_gained': gold,
+                'turns': self.turn_counter}
     
     def calculate_damage(self, attacker, defender):
         """
@@ -227,21 +273,347 @@ class SimpleBattle:
         
         Returns: True if escaped, False if failed
         """
-        import random
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             self.combat_active = False
             return True
         else:
             return False
 
 
+# ============================================================================
+# RANDOM STREAMS
+# ============================================================================
+
+def battle_rng(master_seed, *key):
+    """
+    Return an independent random stream for one battle
+    
+    The stream is seeded from a hash of the master seed and the key
+    (e.g. battle number, or shard and battle number), so the same seed
+    and key give bit-for-bit the same rolls in any process, and
+    different keys give unrelated streams. master_seed=None gives an
+    unpredictable stream.
+    
+    Returns: random.Random
+    """
+    import random
+    if master_seed is None:
+        return random.Random()
+    digest = hashlib.sha256(repr((master_seed,) + key).encode()).digest()
+    return random.Random(int.from_bytes(digest[:16], "big"))
+
+
+# ============================================================================
+# BATTLE POLICIES
+# ============================================================================
+
+# Player actions a policy can choose
+ATTACK = "attack"
+SPECIAL = "special"
+ESCAPE = "escape"
+ACTIONS = (ATTACK, SPECIAL, ESCAPE)
+
+
+class BattlePolicy(ABC):
+    """
+    Decides the player's action each turn
+    
+    choose_action(battle) returns ATTACK, SPECIAL or ESCAPE; anything
+    else counts as an invalid choice and the turn is lost.
+    """
+
+    @abstractmethod
+    def choose_action(self, battle):
+        raise NotImplementedError
+
+
+class HumanPolicy(BattlePolicy):
+    """Ask the player on the command line"""
+
+    CHOICES = {'1': ATTACK, '2': SPECIAL, '3': ESCAPE}
+
+    def choose_action(self, battle):
+        print("\nYour turn! Choose an action:")
+        print("1. Basic Attack")
+        print("2. Special Ability")
+        print("3. Try to Run")
+        choice = input("Enter the number of your choice: ")
+        return self.CHOICES.get(choice.strip())
+
+
+class ScriptedPolicy(BattlePolicy):
+    """Play a fixed list of actions, then keep choosing 'then'"""
+
+    def __init__(self, actions, then=ATTACK):
+        self.actions = list(actions)
+        self.then = then
+        self._next = 0
+
+    def choose_action(self, battle):
+        if self._next < len(self.actions):
+            action = self.actions[self._next]
+            self._next += 1
+            return action
+        return self.then
+
+
+class RandomPolicy(BattlePolicy):
+    """
+    Pick actions at random
+    
+    weights: optional {action: weight}; by default every action is
+    equally likely. rng: a random.Random to draw from; by default the
+    battle's own rng.
+    """
+
+    def __init__(self, weights=None, rng=None):
+        weights = weights or {action: 1 for action in ACTIONS}
+        self.actions = list(weights)
+        self.weights = [weights[action] for action in self.actions]
+        self.rng = rng
+
+    def choose_action(self, battle):
+        rng = battle.rng if self.rng is None else self.rng
+        return rng.choices(self.actions, self.weights)[0]
+
+
+class GreedyPolicy(BattlePolicy):
+    """
+    Maximize expected damage this turn; never run
+    
+    Takes a certain kill with a basic attack when there is one, and a
+    Cleric heals when the next enemy hit would be fatal and healing lets
+    them survive it.
+    """
+
+    def choose_action(self, battle):
+        character, enemy = battle.character, battle.enemy
+        attack_damage = battle.calculate_damage(character, enemy)
+        if attack_damage >= enemy['health']:
+            return ATTACK
+
+        if character.get('class') == "Cleric":
+            incoming = battle.calculate_damage(enemy, character)
+            healed = min(character['health'] + 30, character['max_health'])
+            if character['health'] <= incoming < healed:
+                return SPECIAL
+            return ATTACK
+
+        return SPECIAL if expected_special_damage(character) > attack_damage else ATTACK
+
+
+def expected_special_damage(character):
+    """
+    Return the average damage of a character's special ability
+    
+    Rogue Critical Strike averages 3x and 1x strength; Cleric Heal and
+    unknown classes do no damage.
+    """
+    char_class = character.get('class')
+    if char_class in ("Warrior", "Rogue"):
+        return character['strength'] * 2
+    elif char_class == "Mage":
+        return character['magic'] * 2
+    return 0
+
+
+# ============================================================================
+# OUTCOME SOLVER
+# ============================================================================
+
+# Policies the solver understands (ScriptedPolicy([]), GreedyPolicy, RandomPolicy)
+SOLVER_POLICIES = ("attack", "greedy", "random")
+
+# The turn-by-turn solver stops once less probability than this is left
+SOLVER_TOLERANCE = 1e-12
+SOLVER_MAX_TURNS = 10000
+
+
+def solve_battle(character, enemy, policy="greedy"):
+    """
+    Compute the exact outcome distribution of a battle without playing it
+    
+    When every turn is deterministic (the 'attack' policy, or 'greedy'
+    for a class whose special does fixed damage) the answer follows in
+    O(1) from how many hits each side needs: ceil(hp / damage). Rogue
+    crits, Cleric heals and escape rolls are handled by stepping the
+    probability of every (health, enemy health) state forward one turn
+    at a time with the SimpleBattle rules. That stops after
+    SOLVER_MAX_TURNS turns, or once less than SOLVER_TOLERANCE of the
+    probability is still fighting; whatever is left is reported as
+    'unresolved' rather than spread over the outcomes.
+    
+    Returns: {'win', 'loss', 'escape', 'unresolved': probabilities,
+              'expected_turns', 'expected_hp': means over the resolved
+              outcomes, weighted by their probability,
+              'outcomes': {(winner, health, enemy_health, turns): probability}}
+    Raises: CharacterDeadError if character is already dead
+            ValueError for an unknown policy
+    """
+    if policy not in SOLVER_POLICIES:
+        raise ValueError(f"Unknown policy '{policy}'")
+    if character['health'] <= 0:
+        raise CharacterDeadError("Character is dead and cannot fight.")
+
+    if policy == "attack" or (policy == "greedy"
+                              and character.get('class') not in ("Rogue", "Cleric")):
+        return _solve_fixed_damage(character, enemy, policy)
+    return _solve_by_turns(character, enemy, policy)
+
+
+def fast_forward_battle(character, enemy, policy="greedy", rng=None):
+    """
+    Resolve a battle instantly by drawing one outcome from solve_battle()
+    
+    Health of both sides is set to the drawn end state. The draw is
+    among the resolved outcomes, so a battle the solver could not finish
+    counts as one of those.
+    
+    Returns: Same dictionary as SimpleBattle.start_battle()
+    Raises: CharacterDeadError if character is already dead
+    """
+    import random
+    rng = random if rng is None else rng
+
+    outcomes = solve_battle(character, enemy, policy)['outcomes']
+    roll = rng.random() * sum(outcomes.values())
+    for (winner, health, enemy_health, turns), probability in outcomes.items():
+        roll -= probability
+        if roll < 0:
+            break
+
+    character['health'] = health
+    enemy['health'] = enemy_health
+    if winner == 'player':
+        return {'winner': winner, 'xp_gained': enemy['xp_reward'],
+                'gold_gained': enemy['gold_reward'], 'turns': turns}
+    return {'winner': winner, 'xp_gained': 0, 'gold_gained': 0, 'turns': turns}
+
+
+def _solve_fixed_damage(character, enemy, policy):
+    """O(1) outcome when both sides deal the same damage every turn"""
+    battle = SimpleBattle(character, enemy, quiet=True)
+    damage = battle.calculate_damage(character, enemy)
+    if policy == "greedy":
+        # Greedy uses the special whenever it out-damages a basic attack
+        damage = max(damage, expected_special_damage(character))
+    counter = battle.calculate_damage(enemy, character)
+
+    hits_to_win = -(-enemy['health'] // damage)         # ceil
+    hits_to_lose = -(-character['health'] // counter)
+
+    # The player strikes first, so a tie goes to the player
+    if hits_to_win <= hits_to_lose:
+        outcome = ('player', character['health'] - (hits_to_win - 1) * counter, 0, hits_to_win)
+    else:
+        outcome = ('enemy', 0, enemy['health'] - hits_to_lose * damage, hits_to_lose)
+    return _summarize_outcomes({outcome: 1.0})
+
+
+def _solve_by_turns(character, enemy, policy):
+    """Exact outcome distribution by propagating state probabilities turn by turn"""
+    greedy = GreedyPolicy()
+    transitions = {}
+
+    def step(health, enemy_health):
+        """[(probability, winner or None, health, enemy_health)] for one turn"""
+        if policy == "random":
+            actions = [(1 / 3, ATTACK), (1 / 3, SPECIAL), (1 / 3, ESCAPE)]
+        elif policy == "attack":
+            actions = [(1.0, ATTACK)]
+        else:
+            battle = SimpleBattle(dict(character, health=health),
+                                  dict(enemy, health=enemy_health), quiet=True)
+            actions = [(1.0, greedy.choose_action(battle))]
+
+        results = []
+        for action_probability, action in actions:
+            for probability, h, e, escaped in _player_action(character, enemy, action,
+                                                              health, enemy_health):
+                probability *= action_probability
+                if e <= 0:
+                    results.append((probability, 'player', h, 0))
+                elif escaped:
+                    results.append((probability, 'escaped', h, e))
+                else:
+                    h = max(h - counter, 0)
+                    results.append((probability, 'enemy' if h <= 0 else None, h, e))
+        return results
+
+    counter = SimpleBattle(character, enemy, quiet=True).calculate_damage(enemy, character)
+    outcomes = {}
+    states = {(character['health'], enemy['health']): 1.0}
+    turn = 0
+
+    while states and turn < SOLVER_MAX_TURNS and sum(states.values()) > SOLVER_TOLERANCE:
+        turn += 1
+        next_states = {}
+        for state, state_probability in states.items():
+            if state not in transitions:
+                transitions[state] = step(*state)
+            for probability, winner, h, e in transitions[state]:
+                probability *= state_probability
+                if winner is None:
+                    next_states[(h, e)] = next_states.get((h, e), 0.0) + probability
+                else:
+                    key = (winner, h, e, turn)
+                    outcomes[key] = outcomes.get(key, 0.0) + probability
+        states = next_states
+
+    return _summarize_outcomes(outcomes, unresolved=sum(states.values()))
+
+
+def _player_action(character, enemy, action, health, enemy_health):
+    """[(probability, health, enemy_health, escaped)] after the player's action"""
+    if action == ATTACK:
+        damage = SimpleBattle(character, enemy, quiet=True).calculate_damage(character, enemy)
+        return [(1.0, health, max(enemy_health - damage, 0), False)]
+
+    if action == ESCAPE:
+        # attempt_escape succeeds half the time
+        return [(0.5, health, enemy_health, True), (0.5, health, enemy_health, False)]
+
+    if action != SPECIAL:
+        return [(1.0, health, enemy_health, False)]
+
+    char_class = character.get('class')
+    if char_class == "Rogue":
+        # rogue_critical_strike: 3x strength half the time, else 1x
+        return [(0.5, health, max(enemy_health - character['strength'] * 3, 0), False),
+                (0.5, health, max(enemy_health - character['strength'], 0), False)]
+
+    # The other abilities are deterministic, so just apply them to copies
+    hero = dict(character, health=health)
+    target = dict(enemy, health=enemy_health)
+    use_special_ability(hero, target)
+    return [(1.0, hero['health'], target['health'], False)]
+
+
+def _summarize_outcomes(outcomes, unresolved=0.0):
+    """Add win/loss/escape/unresolved probabilities and means to an outcome table"""
+    totals = {'player': 0.0, 'enemy': 0.0, 'escaped': 0.0}
+    expected_turns = expected_hp = 0.0
+    for (winner, health, enemy_health, turns), probability in outcomes.items():
+        totals[winner] += probability
+        expected_turns += probability * turns
+        expected_hp += probability * health
+
+    return {
+        'win': totals['player'],
+        'loss': totals['enemy'],
+        'escape': totals['escaped'],
+        'unresolved': unresolved,
+        'expected_turns': expected_turns,
+        'expected_hp': expected_hp,
+        'outcomes': outcomes
+    }
 
 
 # ============================================================================
 # SPECIAL ABILITIES
 # ============================================================================
 
-def use_special_ability(character, enemy):
+def use_special_ability(character, enemy, rng=None):
     """
     Use character's class-specific special ability
     
@@ -251,6 +623,9 @@ def use_special_ability(character, enemy):
     - Rogue: Critical Strike (3x strength damage, 50% chance)
     - Cleric: Heal (restore 30 health)
     
+    rng: random number source for the Rogue's crit roll (default: the
+    global random module)
+    
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
@@ -262,7 +637,7 @@ def use_special_ability(character, enemy):
         mage_fireball(character, enemy)
         return f"{character['name']} casts Fireball!"
     elif char_class == "Rogue":
-        rogue_critical_strike(character, enemy)
+        rogue_critical_strike(character, enemy, rng)
         return f"{character['name']} attempts a Critical Strike!"
     elif char_class == "Cleric":
         cleric_heal(character)
@@ -292,10 +667,11 @@ def mage_fireball(character, enemy):
 
 
 
-def rogue_critical_strike(character, enemy):
+def rogue_critical_strike(character, enemy, rng=None):
     """Rogue special ability"""
     import random
-    if random.random() < 0.5:
+    rng = random if rng is None else rng
+    if rng.random() < 0.5:
         damage = character['strength'] * 3
     else:
         damage = character['strength']
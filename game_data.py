@@ -10,17 +10,37 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import sys
+import mmap
+import time
+import marshal
+import glob
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from collections.abc import Mapping
+from symbols import SymbolTable, SYMBOLS
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
-    CorruptedDataError
+    CorruptedDataError,
+    InvalidItemTypeError
 )
 
+# NumPy is optional; the columnar item view is only available with it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+# Bump this whenever the compiled snapshot layout changes
+CACHE_VERSION = 2
+
+def load_quests(filename="data/quests.txt", use_cache=False):
     """
     Load quest data from file
     
@@ -33,55 +53,31 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    If use_cache is True, a valid compiled snapshot is returned without
+    parsing, and a fresh snapshot is written after a full parse.
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Quest data file '{filename}' not found.")
+    if use_cache:
+        quests = load_compiled(filename)
+        if quests is not None:
+            return quests
+        signature = _source_signature(filename)
 
     quests = {}
 
-    try:
-        with open(filename, 'r') as file:
-            content = file.read().strip()   # Read entire file
+    # Store each quest using quest_id as the key
+    for quest_data in iter_quests(filename):
+        quests[quest_data['quest_id']] = quest_data
 
-            # Check if file is empty
-            if not content:
-                raise InvalidDataFormatError("Quest file is empty.")
-
-            # Split quests by double newlines (separates quest blocks)
-            quest_blocks = [b for b in content.split("\n\n") if b.strip()]
-
-            # Process each quest block individually
-            for block in quest_blocks:
-                # Break into individual lines, remove empty lines
-                lines = [line for line in block.split("\n") if line.strip()]
-
-                # Convert text lines into a quest dictionary
-                quest_data = parse_quest_block(lines)
-
-                # Validate required fields + data types
-                validate_quest_data(quest_data)
-
-                # Store using quest_id as the key
-                quests[quest_data['quest_id']] = quest_data
-
-    # Pass through known errors unchanged
-    except InvalidDataFormatError:
-        raise
-    except MissingDataFileError:
-        raise
-
-    # Catch any unexpected error and label it as corrupted data
-    except Exception as e:
-        raise CorruptedDataError(f"Corrupted quest data: {e}")
+    if use_cache:
+        _write_compiled(filename, quests, signature)
 
     return quests
 
 
-
-
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=False):
     """
     Load item data from file
     
@@ -93,36 +89,93 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    If use_cache is True, a valid compiled snapshot is returned without
+    parsing, and a fresh snapshot is written after a full parse.
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    if not os.path.exists(filename):
-        raise MissingDataFileError(f"Item data file '{filename}' not found.")
+    if use_cache:
+        items = load_compiled(filename)
+        if items is not None:
+            return items
+        signature = _source_signature(filename)
 
     items = {}
 
+    # Store each item using item_id as the key
+    for item_data in iter_items(filename):
+        items[item_data['item_id']] = item_data
+
+    if use_cache:
+        _write_compiled(filename, items, signature)
+
+    return items
+
+
+def iter_quests(filename="data/quests.txt"):
+    """
+    Stream quest data from file one quest at a time
+    
+    The file is read line by line, so only the current quest block is
+    held in memory. Each yielded quest has already been validated.
+    
+    Yields: Quest record for each quest block
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Quest data file '{filename}' not found.")
+
     try:
         with open(filename, 'r') as file:
-            content = file.read().strip()
+            found = False
 
-            # File must not be empty
-            if not content:
-                raise InvalidDataFormatError("Item file is empty.")
+            for lines in _read_blocks(file):
+                # Parse, coerce and validate the block in one pass
+                quest = parse_quest_record(lines)
+
+                found = True
+                yield quest
+
+            # Check if file is empty
+            if not found:
+                raise InvalidDataFormatError("Quest file is empty.")
+
+    # Pass through known errors unchanged
+    except InvalidDataFormatError:
+        raise
+    except MissingDataFileError:
+        raise
 
-            # Split items into separate blocks (blank line separated)
-            item_blocks = [b for b in content.split("\n\n") if b.strip()]
+    # Catch any unexpected error and label it as corrupted data
+    except Exception as e:
+        raise CorruptedDataError(f"Corrupted quest data: {e}")
 
-            for block in item_blocks:
-                lines = [line for line in block.split("\n") if line.strip()]
 
-                # Convert block into structured dictionary
-                item_data = parse_item_block(lines)
+def iter_items(filename="data/items.txt"):
+    """
+    Stream item data from file one item at a time
+    
+    Yields: Item record for each item block
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Item data file '{filename}' not found.")
 
-                # Validate required fields
-                validate_item_data(item_data)
+    try:
+        with open(filename, 'r') as file:
+            found = False
 
-                # Store item using item_id as key
-                items[item_data['item_id']] = item_data
+            for lines in _read_blocks(file):
+                # Parse, coerce and validate the block in one pass
+                item = parse_item_record(lines)
+
+                found = True
+                yield item
+
+            # File must not be empty
+            if not found:
+                raise InvalidDataFormatError("Item file is empty.")
 
     except InvalidDataFormatError:
         raise
@@ -132,8 +185,6 @@ def load_items(filename="data/items.txt"):
     except Exception as e:
         raise CorruptedDataError(f"Corrupted item data: {e}")
 
-    return items
-
 def validate_quest_data(quest_dict):
     """
     Validate that quest dictionary has all required fields
@@ -232,10 +283,763 @@ def create_default_data_files():
                 "DESCRIPTION: Basic starter weapon\n"
             )
 
+# ============================================================================
+# RECORD TYPES
+# ============================================================================
+
+class _Record(Mapping):
+    """
+    Compact, read-only record with dictionary-style access
+    
+    Known fields are stored in __slots__ instead of a per-record dict.
+    Any extra keys found in a data block are kept in the 'extra' slot.
+    Records can be read like the dictionaries the loaders used to return:
+    record['field'], record.get('field'), 'field' in record, dict(record).
+    """
+    __slots__ = ('extra',)
+    FIELDS = ()
+    _FIELD_SET = frozenset()
+
+    def __init__(self, *values, extra=None):
+        for field, value in zip(self.FIELDS, values):
+            setattr(self, field, value)
+        self.extra = extra
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a parsed (and validated) block dictionary"""
+        values = [data[field] for field in cls.FIELDS]
+        extra = {key: value for key, value in data.items() if key not in cls._FIELD_SET}
+        return cls(*values, extra=extra or None)
+
+    @classmethod
+    def from_row(cls, row):
+        """Build a record from the tuple produced by to_row()"""
+        return cls(*row[:-1], extra=row[-1])
+
+    def to_row(self):
+        """Return the record as a flat tuple (field values, then extras)"""
+        return tuple(getattr(self, field) for field in self.FIELDS) + (self.extra,)
+
+    def __getitem__(self, key):
+        if key in self._FIELD_SET:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        yield from self.FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return len(self.FIELDS) + (len(self.extra) if self.extra else 0)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
+class Quest(_Record):
+    """Quest record produced by load_quests / iter_quests"""
+    FIELDS = (
+        'quest_id', 'title', 'description',
+        'reward_xp', 'reward_gold',
+        'required_level', 'prerequisite'
+    )
+    _FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS
+
+
+class Item(_Record):
+    """Item record produced by load_items / iter_items"""
+    FIELDS = ('item_id', 'name', 'type', 'effect', 'cost', 'description')
+    _FIELD_SET = frozenset(FIELDS)
+    __slots__ = FIELDS
+
+
+# Record type stored in each compiled snapshot, by name
+RECORD_TYPES = {'Quest': Quest, 'Item': Item}
+
+
+def measure_record_memory(count=1000000):
+    """
+    Compare memory used by dict records against slotted Item records
+    
+    Builds a synthetic catalog of 'count' items both ways and measures
+    each with tracemalloc.
+    
+    Returns: Dictionary with 'dict_bytes' and 'record_bytes'
+    """
+    import tracemalloc
+
+    def build(as_record):
+        catalog = {}
+        for i in range(count):
+            data = {
+                'item_id': f"item_{i}",
+                'name': f"Item {i}",
+                'type': 'weapon',
+                'effect': 'strength:5',
+                'cost': i,
+                'description': 'Synthetic item'
+            }
+            catalog[data['item_id']] = Item.from_dict(data) if as_record else data
+        return catalog
+
+    results = {}
+    for key, as_record in (('dict_bytes', False), ('record_bytes', True)):
+        tracemalloc.start()
+        catalog = build(as_record)
+        results[key] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del catalog
+
+    return results
+
+
+# ============================================================================
+# RECORD SCHEMAS
+# ============================================================================
+
+# Schema kind for text fields that repeat across records and are interned
+SYMBOL = 'symbol'
+
+# Field schemas: str (kept as text), SYMBOL (interned text), int (coerced),
+# or a tuple of the allowed values for an enum field
+QUEST_SCHEMA = {
+    'quest_id': str,
+    'title': str,
+    'description': str,
+    'reward_xp': int,
+    'reward_gold': int,
+    'required_level': int,
+    'prerequisite': SYMBOL
+}
+
+ITEM_SCHEMA = {
+    'item_id': str,
+    'name': str,
+    'type': ('weapon', 'armor', 'consumable'),
+    'effect': SYMBOL,
+    'cost': int,
+    'description': str
+}
+
+
+def compile_schema(record_type, schema, label):
+    """
+    Compile a field schema into a single-pass block parser
+    
+    The returned function takes the lines of one block and, in one loop,
+    splits each 'KEY: value' line, coerces int fields, checks enum fields,
+    then checks that every required field is present. It returns a
+    record_type instance, so no separate validate step is needed.
+    
+    Enum values are replaced by the schema's own string objects and
+    SYMBOL fields go through the shared SYMBOLS table, so repeated values
+    such as 'weapon' or 'NONE' are stored once.
+    
+    Raises (from the parser): InvalidDataFormatError
+    """
+    fields = record_type.FIELDS
+    int_fields = frozenset(f for f, kind in schema.items() if kind is int)
+    symbol_fields = frozenset(f for f, kind in schema.items() if kind == SYMBOL)
+    enum_fields = {
+        f: {value: value for value in kind}
+        for f, kind in schema.items() if isinstance(kind, tuple)
+    }
+    intern = SYMBOLS.intern
+
+    def parse(lines):
+        data = {}
+
+        for line in lines:
+            key, separator, value = line.partition(": ")
+            if not separator:
+                raise InvalidDataFormatError(f"Invalid line: {line}")
+
+            key = key.strip().lower()
+            value = value.strip()
+
+            if key in int_fields:
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise InvalidDataFormatError(
+                        f"{label.capitalize()} field '{key}' must be an integer."
+                    )
+            elif key in symbol_fields:
+                value = intern(value)
+            elif key in enum_fields:
+                if value not in enum_fields[key]:
+                    raise InvalidDataFormatError(f"Invalid {label} {key}: {value}")
+                value = enum_fields[key][value]
+
+            data[key] = value
+
+        # Pull the known fields out; whatever is left is extra data
+        try:
+            values = [data.pop(field) for field in fields]
+        except KeyError as e:
+            raise InvalidDataFormatError(f"Missing required {label} field: {e.args[0]}")
+
+        if data:
+            data = {intern(key): value for key, value in data.items()}
+        return record_type(*values, extra=data or None)
+
+    return parse
+
+
+parse_quest_record = compile_schema(Quest, QUEST_SCHEMA, "quest")
+parse_item_record = compile_schema(Item, ITEM_SCHEMA, "item")
+
+
+def benchmark_parsers(count=100000):
+    """
+    Time the fused schema parsers against parse_*_block + validate_*_data
+    
+    Returns: Dictionary with 'separate' and 'fused' times in seconds
+    """
+    blocks = []
+    for i in range(count):
+        blocks.append([
+            f"QUEST_ID: quest_{i}",
+            f"TITLE: Quest {i}",
+            "DESCRIPTION: Synthetic quest",
+            "REWARD_XP: 100",
+            "REWARD_GOLD: 50",
+            "REQUIRED_LEVEL: 3",
+            "PREREQUISITE: NONE"
+        ])
+
+    start = time.perf_counter()
+    for lines in blocks:
+        quest_data = parse_quest_block(lines)
+        validate_quest_data(quest_data)
+        Quest.from_dict(quest_data)
+    separate = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for lines in blocks:
+        parse_quest_record(lines)
+    fused = time.perf_counter() - start
+
+    return {'separate': separate, 'fused': fused}
+
+
+# ============================================================================
+# LAZY ITEM CATALOG
+# ============================================================================
+
+class ItemCatalog(Mapping):
+    """
+    Read-only, lazily parsed view of an item data file
+    
+    The file is memory-mapped and scanned once to build an
+    ITEM_ID -> byte range index. A block is only parsed and validated the
+    first time its item is looked up, and the most recently used parsed
+    items are kept in a small LRU cache.
+    
+    Supports the same read access as the dictionary from load_items:
+    catalog[item_id], item_id in catalog, catalog.get(), .items(), len().
+    """
+
+    def __init__(self, filename="data/items.txt", cache_size=128):
+        """Open and index an item data file"""
+        if not os.path.exists(filename):
+            raise MissingDataFileError(f"Item data file '{filename}' not found.")
+
+        if os.path.getsize(filename) == 0:
+            raise InvalidDataFormatError("Item file is empty.")
+
+        self.filename = filename
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._file = open(filename, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            self._offsets = self._build_index()
+        except Exception:
+            self.close()
+            raise
+
+        if not self._offsets:
+            self.close()
+            raise InvalidDataFormatError("Item file is empty.")
+
+    def _build_index(self):
+        """Scan the file once and record where each item block starts and ends"""
+        offsets = {}
+        block_start = None
+        item_id = None
+        position = 0
+
+        self._map.seek(0)
+        for line in iter(self._map.readline, b''):
+            stripped = line.strip()
+
+            if not stripped:
+                # A blank line ends the current block
+                if block_start is not None:
+                    offsets[self._require_id(item_id)] = (block_start, position)
+                    block_start = None
+                    item_id = None
+            else:
+                if block_start is None:
+                    block_start = position
+                if stripped.startswith(b"ITEM_ID: "):
+                    item_id = stripped[len(b"ITEM_ID: "):].strip().decode()
+
+            position += len(line)
+
+        # Last block may not be followed by a blank line
+        if block_start is not None:
+            offsets[self._require_id(item_id)] = (block_start, position)
+
+        return offsets
+
+    @staticmethod
+    def _require_id(item_id):
+        """Make sure an indexed block actually declared an ITEM_ID"""
+        if item_id is None:
+            raise InvalidDataFormatError("Missing required item field: item_id")
+        return item_id
+
+    def __getitem__(self, item_id):
+        """Return the parsed item, parsing its block on first access"""
+        if item_id in self._cache:
+            self._cache.move_to_end(item_id)
+            return self._cache[item_id]
+
+        start, end = self._offsets[item_id]
+        block = self._map[start:end].decode()
+        lines = [line for line in block.splitlines() if line.strip()]
+
+        item_data = parse_item_record(lines)
+
+        # Remember the item and drop the least recently used one if full
+        self._cache[item_id] = item_data
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return item_data
+
+    def __contains__(self, item_id):
+        return item_id in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def close(self):
+        """Release the memory map and the underlying file"""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# ============================================================================
+# COLUMNAR ITEM VIEW
+# ============================================================================
+
+# Integer codes used for the item type column
+ITEM_TYPE_CODES = {'weapon': 0, 'armor': 1, 'consumable': 2}
+
+
+class ItemColumns:
+    """
+    Columnar (NumPy) view of an item catalog for vectorized shop queries
+    
+    Holds parallel arrays built once from a load_items style mapping:
+    cost, type code, and one effect-magnitude array per stat (0 where an
+    item does not affect that stat). Row i of every array is item_ids[i].
+    
+    Raises: ImportError if NumPy is not installed
+    """
+
+    def __init__(self, items):
+        """Build the column arrays from an item mapping"""
+        if numpy is None:
+            raise ImportError("NumPy is required for ItemColumns")
+
+        # Imported here because inventory_system imports this module
+        from inventory_system import parse_effect_string
+
+        self.item_ids = list(items)
+        count = len(self.item_ids)
+
+        self.cost = numpy.empty(count, dtype=numpy.int64)
+        self.type_code = numpy.empty(count, dtype=numpy.int8)
+        self.effects = {}
+
+        for index, item_id in enumerate(self.item_ids):
+            item = items[item_id]
+            self.cost[index] = item['cost']
+            self.type_code[index] = ITEM_TYPE_CODES[item['type']]
+
+            for stat, value in parse_effect_string(item['effect']).items():
+                if stat not in self.effects:
+                    self.effects[stat] = numpy.zeros(count, dtype=numpy.int64)
+                self.effects[stat][index] = value
+
+    def __len__(self):
+        return len(self.item_ids)
+
+    def effect(self, stat):
+        """Return the effect-magnitude column for a stat (zeros if unused)"""
+        if stat in self.effects:
+            return self.effects[stat]
+        return numpy.zeros(len(self.item_ids), dtype=numpy.int64)
+
+    def _type_mask(self, item_type=None):
+        """Boolean mask selecting one item type (or every item)"""
+        if item_type is None:
+            return numpy.ones(len(self.item_ids), dtype=bool)
+        if item_type not in ITEM_TYPE_CODES:
+            raise InvalidItemTypeError(f"Invalid item type: {item_type}")
+        return self.type_code == ITEM_TYPE_CODES[item_type]
+
+    def _ids_at(self, indexes):
+        return [self.item_ids[i] for i in indexes]
+
+    def affordable(self, gold, item_type=None):
+        """Return IDs of every item costing at most 'gold', in catalog order"""
+        mask = (self.cost <= gold) & self._type_mask(item_type)
+        return self._ids_at(numpy.flatnonzero(mask))
+
+    def cheapest(self, item_type, stat):
+        """
+        Return the cheapest item of a type that raises 'stat'
+        
+        Ties on cost go to the item with the larger bonus.
+        Returns: item ID, or None if no item of that type raises the stat
+        """
+        bonus = self.effect(stat)
+        candidates = numpy.flatnonzero(self._type_mask(item_type) & (bonus > 0))
+        if candidates.size == 0:
+            return None
+
+        # lexsort uses the last key as the primary sort key
+        order = numpy.lexsort((-bonus[candidates], self.cost[candidates]))
+        return self.item_ids[candidates[order[0]]]
+
+    def top_k(self, k, key='cost', item_type=None):
+        """
+        Return the IDs of the k items with the highest 'key' value
+        
+        key is 'cost' or a stat name such as 'strength'.
+        """
+        values = self.cost if key == 'cost' else self.effect(key)
+        candidates = numpy.flatnonzero(self._type_mask(item_type))
+        k = min(k, candidates.size)
+        if k <= 0:
+            return []
+
+        # Partial selection first, then sort only the k winners
+        values = values[candidates]
+        top = numpy.argpartition(-values, k - 1)[:k]
+        top = top[numpy.argsort(-values[top], kind='stable')]
+        return self._ids_at(candidates[top])
+
+
+def build_item_columns(items):
+    """
+    Build an ItemColumns view of an item mapping if NumPy is available
+    
+    Returns: ItemColumns, or None when NumPy is not installed
+    """
+    if numpy is None:
+        return None
+    return ItemColumns(items)
+
+
+# ============================================================================
+# SHARDED DATA DIRECTORIES
+# ============================================================================
+
+def load_quest_shards(directory="data/quests.d", max_workers=None):
+    """
+    Load every *.txt quest shard in a directory in parallel
+    
+    Shards are parsed on a process pool and merged into one dictionary.
+    A quest ID that appears in more than one shard is an error.
+    
+    Returns: Dictionary of quests {quest_id: Quest}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _load_shards(directory, 'Quest', max_workers)
+
+
+def load_item_shards(directory="data/items.d", max_workers=None):
+    """
+    Load every *.txt item shard in a directory in parallel
+    
+    Returns: Dictionary of items {item_id: Item}
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    return _load_shards(directory, 'Item', max_workers)
+
+
+def _load_shard(filename, kind):
+    """Parse one shard file and return its records as flat rows (worker side)"""
+    loader = iter_quests if kind == 'Quest' else iter_items
+    return [record.to_row() for record in loader(filename)]
+
+
+def _load_shards(directory, kind, max_workers):
+    """Parse shard files on a process pool and merge them with duplicate checks"""
+    shard_files = sorted(glob.glob(os.path.join(directory, "*.txt")))
+    if not shard_files:
+        raise MissingDataFileError(f"No shard files found in '{directory}'.")
+
+    # Rows are cheaper to send between processes than record objects
+    if len(shard_files) == 1 or max_workers == 1:
+        shard_rows = [_load_shard(filename, kind) for filename in shard_files]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            shard_rows = list(pool.map(_load_shard, shard_files, [kind] * len(shard_files)))
+
+    record_type = RECORD_TYPES[kind]
+    records = {}
+    sources = {}
+
+    for filename, rows in zip(shard_files, shard_rows):
+        for row in rows:
+            record_id = row[0]
+            if record_id in sources and sources[record_id] != filename:
+                raise InvalidDataFormatError(
+                    f"Duplicate {kind.lower()} ID '{record_id}' in "
+                    f"'{sources[record_id]}' and '{filename}'"
+                )
+            sources[record_id] = filename
+            records[record_id] = record_type.from_row(row)
+
+    return records
+
+
+# ============================================================================
+# INCREMENTAL RELOAD
+# ============================================================================
+
+def reload_records(filename, kind, previous_blocks=None):
+    """
+    Re-read a data file, parsing only blocks whose text changed
+    
+    Args:
+        filename: Quest or item data file
+        kind: 'Quest' or 'Item'
+        previous_blocks: {block_text: record} from the previous reload
+    
+    Unchanged blocks reuse the exact record object from previous_blocks,
+    so callers can find changed records with an identity check.
+    
+    Returns: (records, blocks) - {record_id: record} and the new
+             {block_text: record} map to pass to the next reload
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if not os.path.exists(filename):
+        raise MissingDataFileError(f"Data file '{filename}' not found.")
+
+    parser = parse_quest_record if kind == 'Quest' else parse_item_record
+    previous_blocks = previous_blocks or {}
+    records = {}
+    blocks = {}
+
+    try:
+        with open(filename, 'r') as file:
+            for lines in _read_blocks(file):
+                text = "\n".join(lines)
+                record = previous_blocks.get(text)
+                if record is None:
+                    record = parser(lines)
+
+                blocks[text] = record
+                records[record[record.FIELDS[0]]] = record
+
+    except InvalidDataFormatError:
+        raise
+    except Exception as e:
+        raise CorruptedDataError(f"Corrupted {kind.lower()} data: {e}")
+
+    if not records:
+        raise InvalidDataFormatError(f"{kind} file is empty.")
+
+    return records, blocks
+
+
+# ============================================================================
+# COMPILED DATA CACHE
+# ============================================================================
+
+def get_cache_path(filename):
+    """Return the path of the compiled snapshot for a data file"""
+    return f"{filename}.cache"
+
+
+def load_compiled(filename):
+    """
+    Load the compiled snapshot for a data file if it is still valid
+    
+    A snapshot is valid when the source file's modification time, size
+    and content hash all match the values recorded when it was written.
+    
+    Returns: Dictionary of records, or None if missing or stale
+    """
+    try:
+        with open(get_cache_path(filename), 'rb') as f:
+            snapshot = marshal.loads(f.read())
+        stat = os.stat(filename)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get('version') != CACHE_VERSION:
+        return None
+
+    # Cheap checks first, then confirm the contents did not change
+    if snapshot['mtime'] != stat.st_mtime_ns or snapshot['size'] != stat.st_size:
+        return None
+    if snapshot['hash'] != _hash_file(filename):
+        return None
+
+    # Rows are stored as flat tuples; the first value is the record's ID
+    record_type = RECORD_TYPES.get(snapshot['kind'])
+    if record_type is None:
+        return None
+
+    return {row[0]: record_type.from_row(row) for row in snapshot['rows']}
+
+
+def compile_data_files(quest_file="data/quests.txt", item_file="data/items.txt"):
+    """
+    Parse both catalogs and write fresh compiled snapshots for them
+    
+    Returns: Dictionary with the number of quests and items compiled
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    quest_signature = _source_signature(quest_file)
+    quests = load_quests(quest_file)
+    _write_compiled(quest_file, quests, quest_signature)
+
+    item_signature = _source_signature(item_file)
+    items = load_items(item_file)
+    _write_compiled(item_file, items, item_signature)
+
+    return {'quests': len(quests), 'items': len(items)}
+
+
+def benchmark_startup(quest_file="data/quests.txt", item_file="data/items.txt", repeat=5):
+    """
+    Time cold (parse + validate) against warm (compiled snapshot) loading
+    
+    Returns: Dictionary with the best 'cold' and 'warm' times in seconds
+    """
+    compile_data_files(quest_file, item_file)
+
+    cold_times = []
+    warm_times = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load_quests(quest_file)
+        load_items(item_file)
+        cold_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        load_quests(quest_file, use_cache=True)
+        load_items(item_file, use_cache=True)
+        warm_times.append(time.perf_counter() - start)
+
+    return {'cold': min(cold_times), 'warm': min(warm_times)}
+
+
+def _source_signature(filename):
+    """
+    Return (mtime, size, content hash) for a data file
+    
+    Raises: MissingDataFileError if the file does not exist
+    """
+    try:
+        stat = os.stat(filename)
+        return stat.st_mtime_ns, stat.st_size, _hash_file(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file '{filename}' not found.") from None
+
+
+def _hash_file(filename):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _write_compiled(filename, records, signature):
+    """
+    Write a compiled snapshot next to a data file
+    
+    The snapshot is written to a temporary file and then renamed, so a
+    reader never sees a half-written cache. Failing to write the cache
+    is not an error; the next load simply parses the source again.
+    """
+    mtime, size, content_hash = signature
+    kind = type(next(iter(records.values()))).__name__ if records else None
+    snapshot = {
+        'version': CACHE_VERSION,
+        'mtime': mtime,
+        'size': size,
+        'hash': content_hash,
+        'kind': kind,
+        'rows': [record.to_row() for record in records.values()]
+    }
+
+    cache_path = get_cache_path(filename)
+    temp_path = f"{cache_path}.tmp"
+
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(marshal.dumps(snapshot))
+        os.replace(temp_path, cache_path)
+    except (OSError, ValueError):
+        pass
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _read_blocks(file):
+    """
+    Yield each blank-line separated block of an open file as a list of lines
+    
+    Blank lines are dropped, so a block is only the lines that hold data.
+    """
+    lines = []
+
+    for line in file:
+        line = line.rstrip("\n")
+
+        # A blank line ends the current block
+        if not line.strip():
+            if lines:
+                yield lines
+                lines = []
+            continue
+
+        lines.append(line)
+
+    # Last block may not be followed by a blank line
+    if lines:
+        yield lines
+
 def parse_quest_block(lines):
     """
     Parse a block of lines into a quest dictionary
@@ -307,6 +1111,44 @@ def parse_item_block(lines):
 # ============================================================================
 
 if __name__ == "__main__":
+    # python -m game_data compile  -> write compiled snapshots
+    # python -m game_data bench    -> compare cold and warm startup
+    # python -m game_data memory   -> compare dict and slotted records
+    # python -m game_data parsers  -> compare fused and separate parsing
+    # python -m game_data symbols  -> report memory saved by interning
+    command = sys.argv[1] if len(sys.argv) > 1 else None
+
+    if command == "compile":
+        counts = compile_data_files()
+        print(f"Compiled {counts['quests']} quests and {counts['items']} items")
+        sys.exit(0)
+
+    if command == "memory":
+        usage = measure_record_memory()
+        print(f"dict records:    {usage['dict_bytes'] / 1e6:.1f} MB")
+        print(f"slotted records: {usage['record_bytes'] / 1e6:.1f} MB")
+        sys.exit(0)
+
+    if command == "symbols":
+        load_quests()
+        load_items()
+        usage = SYMBOLS.stats()
+        print(f"{usage['symbols']} symbols, {usage['hits']} shared values, "
+              f"{usage['bytes_saved']} bytes saved")
+        sys.exit(0)
+
+    if command == "parsers":
+        timings = benchmark_parsers()
+        print(f"parse + validate: {timings['separate'] * 1000:.1f} ms")
+        print(f"fused schema:     {timings['fused'] * 1000:.1f} ms")
+        sys.exit(0)
+
+    if command == "bench":
+        timings = benchmark_startup()
+        print(f"Cold start: {timings['cold'] * 1000:.3f} ms")
+        print(f"Warm start: {timings['warm'] * 1000:.3f} ms")
+        sys.exit(0)
+
     print("=== GAME DATA MODULE TEST ===")
     
     # Test creating default files
@@ -17,6 +17,7 @@ from custom_exceptions import (
     InvalidItemTypeError
 )
 from game_data import parse_item_block
+from symbols import SYMBOLS
 
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
@@ -151,14 +152,14 @@ def sell_item(character, item_id, item_data):
 # -------------------------
 
 def parse_effect_string(effect_str):
-    """Convert 'stat: value, stat2: value2' to dict"""
+    """Convert 'stat: value, stat2: value2' to dict (stat names are shared symbols)"""
     effects = {}
     if not effect_str:
         return effects
     for pair in effect_str.split(','):
         if ':' in pair:
             stat, value = pair.split(':', 1)
-            effects[stat.strip()] = int(value.strip())
+            effects[SYMBOLS.intern(stat.strip())] = int(value.strip())
     return effects
 
 def apply_stat_effect(character, stat, value):
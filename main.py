@@ -10,12 +10,16 @@ This is the main game file that ties all modules together.
 Demonstrates module integration and complete game flow.
 """
 
+import os
+import threading
+
 # Import all our custom modules
 import character_manager
 import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import catalog_watcher
 from custom_exceptions import *
 
 # ============================================================================
@@ -26,7 +30,12 @@ from custom_exceptions import *
 current_character = None
 all_quests = {}
 all_items = {}
+item_columns = None     # Columnar item view (None without NumPy)
+catalog_lock = threading.Lock()   # Guards swapping the three catalog globals
+data_watcher = None     # Hot-reloads quest/item files while playing
 game_running = False
+master_seed = None      # Seeds every battle's random stream (None = unpredictable)
+battle_count = 0        # Battles fought this session, keys each battle's stream
 
 # ============================================================================
 # MAIN MENU
@@ -116,9 +125,11 @@ def load_game():
     # Loads previously saved game
     global current_character
     try:
-        saved_characters = character_manager.list_saved_characters()
+        # Most recently played first, straight from the save manifest
+        entries = character_manager.list_characters(sort_by="modified", reverse=True)
     except Exception:
-        saved_characters = []
+        entries = []
+    saved_characters = [entry['name'] for entry in entries]
 
     # No characters saved
     if not saved_characters:
@@ -126,8 +137,11 @@ def load_game():
         return
 
     print("\nSaved Characters:")
-    for idx, char_name in enumerate(saved_characters, start=1):
-        print(f"{idx}. {char_name}")
+    for idx, entry in enumerate(entries, start=1):
+        if entry['class']:
+            print(f"{idx}. {entry['name']} (Level {entry['level']} {entry['class']})")
+        else:
+            print(f"{idx}. {entry['name']}")
 
     # Select character to load
     while True:
@@ -239,23 +253,24 @@ def view_character_stats():
         print(f"  {stat.capitalize()}: {value}")
 
     print("Active Quests:")
+    quests, _, _ = current_catalogs()
 
     try:
-        active_quests = quest_handler.get_active_quests(current_character, all_quests)
+        active_quests = quest_handler.get_active_quests(current_character, quests)
     except Exception:
         active_quests = []
 
     # Display active quests
     if active_quests:
         for quest_id in active_quests:
-            quest = all_quests.get(quest_id, {})
+            quest = quests.get(quest_id, {})
             print(f"  - {quest.get('title', quest_id)}: {quest.get('description', '')}")
     else:
         print("  None")
 
 def view_inventory():
     """Display and manage inventory"""
-    global current_character, all_items
+    global current_character
     if not current_character:
         print("No character loaded.")
         return
@@ -263,17 +278,20 @@ def view_inventory():
     from inventory_system import use_item, equip_weapon, equip_armor, display_inventory
 
     while True:
+        # One catalog version per action, even if the watcher swaps it meanwhile
+        _, items, _ = current_catalogs()
+
         print("\nInventory:")
-        display_inventory(current_character, all_items)
+        display_inventory(current_character, items)
 
         # Inventory actions
         action = input("\nActions: Use (u), Equip Weapon (w), Equip Armor (a), Back (b): ").lower()
 
         if action == 'u':
             item_id = input("Enter item ID to use: ").strip()
-            if item_id in all_items:
+            if item_id in items:
                 try:
-                    print(use_item(current_character, item_id, all_items[item_id]))
+                    print(use_item(current_character, item_id, items[item_id]))
                 except Exception as e:
                     print(f"Cannot use item: {e}")
             else:
@@ -281,10 +299,10 @@ def view_inventory():
 
         elif action == 'w':
             item_id = input("Enter weapon ID to equip: ").strip()
-            if item_id in all_items:
+            if item_id in items:
                 try:
-                    equip_weapon(current_character, item_id, all_items)
-                    print(f"Equipped weapon: {all_items[item_id]['name']}")
+                    equip_weapon(current_character, item_id, items)
+                    print(f"Equipped weapon: {items[item_id]['name']}")
                 except Exception as e:
                     print(f"Cannot equip weapon: {e}")
             else:
@@ -292,10 +310,10 @@ def view_inventory():
 
         elif action == 'a':
             item_id = input("Enter armor ID to equip: ").strip()
-            if item_id in all_items:
+            if item_id in items:
                 try:
-                    equip_armor(current_character, item_id, all_items)
-                    print(f"Equipped armor: {all_items[item_id]['name']}")
+                    equip_armor(current_character, item_id, items)
+                    print(f"Equipped armor: {items[item_id]['name']}")
                 except Exception as e:
                     print(f"Cannot equip armor: {e}")
             else:
@@ -311,7 +329,7 @@ def view_inventory():
 
 def quest_menu():
     """Quest management menu"""
-    global current_character, all_quests
+    global current_character
     from quest_handler import QuestNotFoundError, QuestAlreadyAcceptedError, QuestNotAcceptedError
 
     while True:
@@ -320,45 +338,46 @@ def quest_menu():
         print("4. Accept Quest\n5. Abandon Quest\n6. Complete Quest (Testing)\n7. Back")
 
         choice = input("Select an option (1-7): ").strip()
+        quests, _, _ = current_catalogs()
 
         if choice == '1':
             try:
-                active_quests = quest_handler.get_active_quests(current_character, all_quests)
+                active_quests = quest_handler.get_active_quests(current_character, quests)
             except Exception:
                 active_quests = []
 
             print("\nActive Quests:")
             if active_quests:
                 for qid in active_quests:
-                    quest = all_quests.get(qid, {})
+                    quest = quests.get(qid, {})
                     print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
             else:
                 print("  None")
 
         elif choice == '2':
             try:
-                available_quests = quest_handler.get_available_quests(current_character, all_quests)
+                available_quests = quest_handler.get_available_quests(current_character, quests)
             except Exception:
                 available_quests = []
 
             print("\nAvailable Quests:")
             if available_quests:
                 for qid in available_quests:
-                    quest = all_quests.get(qid, {})
+                    quest = quests.get(qid, {})
                     print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
             else:
                 print("  None")
 
         elif choice == '3':
             try:
-                completed_quests = quest_handler.get_completed_quests(current_character, all_quests)
+                completed_quests = quest_handler.get_completed_quests(current_character, quests)
             except Exception:
                 completed_quests = []
 
             print("\nCompleted Quests:")
             if completed_quests:
                 for qid in completed_quests:
-                    quest = all_quests.get(qid, {})
+                    quest = quests.get(qid, {})
                     print(f"  - {quest.get('title', qid)}: {quest.get('description', '')}")
             else:
                 print("  None")
@@ -366,7 +385,7 @@ def quest_menu():
         elif choice == '4':
             quest_id = input("Enter Quest ID to accept: ").strip()
             try:
-                quest_handler.accept_quest(current_character, quest_id, all_quests)
+                quest_handler.accept_quest(current_character, quest_id, quests)
                 print(f"Quest '{quest_id}' accepted!")
             except (QuestNotFoundError, QuestAlreadyAcceptedError) as e:
                 print(f"Error: {e}")
@@ -382,7 +401,7 @@ def quest_menu():
         elif choice == '6':
             quest_id = input("Enter Quest ID to complete (testing): ").strip()
             try:
-                quest_handler.complete_quest(current_character, quest_id, all_quests)
+                quest_handler.complete_quest(current_character, quest_id, quests)
                 print(f"Quest '{quest_id}' completed!")
             except QuestNotAcceptedError as e:
                 print(f"Error: {e}")
@@ -396,17 +415,20 @@ def quest_menu():
 
 def explore():
     """Find and fight random enemies"""
-    global current_character
-    import random
+    global current_character, battle_count
     from combat_system import SimpleBattle, CharacterDeadError
 
     if not current_character:
         print("No character loaded.")
         return
 
+    # Every roll of this encounter comes from its own stream
+    rng = combat_system.battle_rng(master_seed, battle_count)
+    battle_count += 1
+
     # Enemy level is equal or slightly higher than player level
     level = current_character.get('level', 1)
-    enemy_level = random.choice([level, level + 1])
+    enemy_level = rng.choice([level, level + 1])
 
     # Generate enemy
     try:
@@ -418,10 +440,17 @@ def explore():
 
     print(f"\nA wild {enemy.get('name', 'Enemy')} (Level {enemy.get('level', '?')}) appears!")
 
-    battle = SimpleBattle(current_character, enemy)
+    print("1. Fight\n2. Fast-forward (auto-battle)")
+    fast_forward = input("Choose (1-2): ").strip() == '2'
 
     try:
-        result = battle.start_battle()
+        if fast_forward:
+            # Draw the result from the exact outcome distribution of a greedy fight
+            result = combat_system.fast_forward_battle(current_character, enemy, rng=rng)
+            print(f"The battle lasted {result['turns']} turns.")
+        else:
+            battle = SimpleBattle(current_character, enemy, rng=rng)
+            result = battle.start_battle()
         winner = result.get('winner') if isinstance(result, dict) else result
 
         if winner in ('player', 'victory'):
@@ -437,6 +466,9 @@ def explore():
             current_character['gold'] = current_character.get('gold', 0) + gold
             print(f"You defeated the {enemy.get('name')}! Gained {xp} XP and {gold} gold.")
 
+        elif winner == 'escaped':
+            print("You live to fight another day.")
+
         else:
             handle_character_death()
 
@@ -445,7 +477,7 @@ def explore():
 
 def shop():
     """Shop menu for buying/selling items"""
-    global current_character, all_items
+    global current_character
     from inventory_system import purchase_item, sell_item
     from inventory_system import InsufficientResourcesError, ItemNotFoundError, InventoryFullError
 
@@ -453,18 +485,28 @@ def shop():
         print("\nShop Menu:\n1. Buy Item\n2. Sell Item\n3. Back")
 
         choice = input("Select an option (1-3): ").strip()
+        _, items, columns = current_catalogs()
 
         if choice == '1':
-            print("\nItems for Sale:")
-            for item_id, item in all_items.items():
-                print(f"  - {item.get('name')} (ID: {item_id}) - Cost: {item.get('cost', 0)} gold")
+            # Every item is listed; the columnar view only speeds up the cost check
+            gold = current_character.get('gold', 0)
+            if columns is not None:
+                affordable = set(columns.affordable(gold))
+            else:
+                affordable = {item_id for item_id, item in items.items()
+                              if item.get('cost', 0) <= gold}
+
+            print(f"\nItems for Sale (* = affordable with {gold} gold):")
+            for item_id, item in items.items():
+                mark = "*" if item_id in affordable else " "
+                print(f" {mark} {item.get('name')} (ID: {item_id}) - Cost: {item.get('cost', 0)} gold")
 
             item_id = input("Enter Item ID to buy: ").strip()
 
-            if item_id in all_items:
+            if item_id in items:
                 try:
-                    purchase_item(current_character, item_id, all_items[item_id])
-                    print(f"Purchased '{all_items[item_id]['name']}'!")
+                    purchase_item(current_character, item_id, items[item_id])
+                    print(f"Purchased '{items[item_id]['name']}'!")
                 except (InsufficientResourcesError, InventoryFullError) as e:
                     print(f"Error: {e}")
             else:
@@ -476,14 +518,14 @@ def shop():
             if inventory:
                 print("\nYour Inventory:")
                 for item_id in inventory:
-                    print(f"  - {all_items.get(item_id, {'name': 'Unknown'})['name']} (ID: {item_id})")
+                    print(f"  - {items.get(item_id, {'name': 'Unknown'})['name']} (ID: {item_id})")
 
                 item_id = input("Enter Item ID to sell: ").strip()
 
-                if item_id in all_items:
+                if item_id in items:
                     try:
-                        gold = sell_item(current_character, item_id, all_items[item_id])
-                        print(f"Sold '{all_items[item_id]['name']}' for {gold} gold!")
+                        gold = sell_item(current_character, item_id, items[item_id])
+                        print(f"Sold '{items[item_id]['name']}' for {gold} gold!")
                     except ItemNotFoundError as e:
                         print(f"Error: {e}")
 
@@ -505,25 +547,72 @@ def save_game():
     """Save current game state"""
     global current_character
     try:
-        character_manager.save_character(current_character)
+        # Journaled saves only append the fields that changed
+        character_manager.save_character(current_character, journal=True)
         print("Game saved successfully!")
     except Exception as e:
         print(f"Error saving game: {e}")
 
 def load_game_data():
     """Load all quest and item data from files"""
-    global all_quests, all_items
+    global all_quests, all_items, item_columns
 
+    # Sharded catalog directories take priority over the single files
     try:
-        all_quests = game_data.load_quests()
+        if os.path.isdir("data/quests.d"):
+            all_quests = game_data.load_quest_shards()
+        else:
+            all_quests = game_data.load_quests(use_cache=True)
     except Exception:
         all_quests = {}
 
     try:
-        all_items = game_data.load_items()
+        if os.path.isdir("data/items.d"):
+            all_items = game_data.load_item_shards()
+        else:
+            all_items = game_data.load_items(use_cache=True)
     except Exception:
         all_items = {}
 
+    # Vectorized view for shop queries (only when NumPy is installed)
+    try:
+        item_columns = game_data.build_item_columns(all_items)
+    except Exception:
+        item_columns = None
+
+
+def swap_catalogs(quests, items):
+    """Swap in new quest and item catalogs from the data watcher"""
+    global all_quests, all_items, item_columns
+
+    try:
+        columns = game_data.build_item_columns(items)
+    except Exception:
+        columns = None
+
+    # Readers take all three under the same lock (current_catalogs), so
+    # they never see new quests with old items
+    with catalog_lock:
+        all_quests, all_items, item_columns = quests, items, columns
+
+
+def current_catalogs():
+    """Return (quests, items, item_columns) from one catalog version"""
+    with catalog_lock:
+        return all_quests, all_items, item_columns
+
+
+def start_data_watcher():
+    """Watch the single-file catalogs and hot-reload them on change"""
+    global data_watcher
+
+    # Sharded catalog directories are not watched
+    if os.path.isdir("data/quests.d") or os.path.isdir("data/items.d"):
+        return
+
+    data_watcher = catalog_watcher.CatalogWatcher(swap_catalogs, all_quests, all_items)
+    data_watcher.start()
+
 
 def handle_character_death():
     """Handle character death"""
@@ -572,8 +661,14 @@ def display_welcome():
 # MAIN EXECUTION
 # ============================================================================
 
-def main():
-    """Main game execution function"""
+def main(seed=None):
+    """
+    Main game execution function
+    
+    seed: master seed for battle randomness, to replay the same battles
+    """
+    global master_seed
+    master_seed = seed
     
     # Display welcome message
     display_welcome()
@@ -590,6 +685,9 @@ def main():
         print(f"Error loading game data: {e}")
         print("Please check data files for errors.")
         return
+
+    # Pick up quest/item edits without restarting
+    start_data_watcher()
     
     # Main menu loop
     while True:
@@ -606,5 +704,8 @@ def main():
             print("Invalid choice. Please select 1-3.")
 
 if __name__ == "__main__":
-    main()
+    import sys
+
+    # python main.py [seed]
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else None)
 
@@ -135,8 +135,12 @@ def get_total_quest_rewards_earned(character, quest_data_dict):
 def get_quests_by_level(quest_data_dict, min_level, max_level):
     return [q for q in quest_data_dict.values() if min_level <= q['required_level'] <= max_level]
 
-def validate_quest_prerequisites(quest_data_dict):
-    for qid, q in quest_data_dict.items():
+def validate_quest_prerequisites(quest_data_dict, quest_ids=None):
+    """Check that prerequisites exist; only quest_ids are checked if given."""
+    if quest_ids is None:
+        quest_ids = quest_data_dict.keys()
+    for qid in quest_ids:
+        q = quest_data_dict[qid]
         prereq = q['prerequisite']
         if prereq != "NONE" and prereq not in quest_data_dict:
             raise QuestNotFoundError(f"Quest '{qid}' has invalid prerequisite '{prereq}'")
@@ -0,0 +1,88 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Symbol Table
+
+Shares one copy of strings that repeat across many records (item types,
+'NONE', item and quest IDs). Kept free of other game modules so anything
+can intern values without pulling in the data loaders or NumPy.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+# Default number of distinct strings a table keeps
+DEFAULT_MAX_SYMBOLS = 100000
+
+# ============================================================================
+# SYMBOL TABLE
+# ============================================================================
+
+class SymbolTable:
+    """
+    Bounded table of canonical strings for values that repeat a lot
+
+    intern() returns one shared object for equal strings, so thousands of
+    records holding 'weapon', 'NONE' or the same item ID keep a single
+    copy. The table holds at most max_symbols strings; when it is full the
+    least recently used one is dropped, so one-off values (old save names,
+    IDs from a catalog that was reloaded) do not stay alive forever.
+    Dropping a symbol only means later copies are no longer shared with
+    earlier ones. Hits are counted so the memory saved can be reported.
+    A lock makes intern() safe from the bulk-load thread pool.
+    """
+
+    def __init__(self, max_symbols=DEFAULT_MAX_SYMBOLS):
+        self.max_symbols = max_symbols
+        self._symbols = OrderedDict()
+        self.hits = 0
+        self.bytes_saved = 0
+        self.evicted = 0
+        self._lock = threading.Lock()
+
+    def intern(self, value):
+        """Return the shared copy of a string, adding it if it is new"""
+        symbols = self._symbols
+        with self._lock:
+            symbol = symbols.get(value)
+            if symbol is None:
+                symbols[value] = value
+                if len(symbols) > self.max_symbols:
+                    symbols.popitem(last=False)
+                    self.evicted += 1
+                return value
+
+            symbols.move_to_end(value)
+            if symbol is not value:
+                self.hits += 1
+                self.bytes_saved += sys.getsizeof(value)
+            return symbol
+
+    def intern_list(self, values):
+        """Intern every string in a list in place and return the list"""
+        for index, value in enumerate(values):
+            if isinstance(value, str):
+                values[index] = self.intern(value)
+        return values
+
+    def stats(self):
+        """
+        Report symbol table usage
+
+        Returns: Dictionary with 'symbols', 'hits', 'bytes_saved' and
+                 'evicted'
+        """
+        with self._lock:
+            return {
+                'symbols': len(self._symbols),
+                'hits': self.hits,
+                'bytes_saved': self.bytes_saved,
+                'evicted': self.evicted
+            }
+
+    def __len__(self):
+        return len(self._symbols)
+
+
+# Symbol table shared by the loaders and character_manager
+SYMBOLS = SymbolTable()
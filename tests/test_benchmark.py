@@ -0,0 +1,46 @@
+"""
+Test Benchmark
+Tests the synthetic data generator and benchmark suite
+"""
+
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import benchmark
+import game_data
+import quest_handler
+
+def test_generated_files_are_valid(tmp_path):
+    """Test that generated catalogs load and validate"""
+    quest_file = str(tmp_path / "quests.txt")
+    item_file = str(tmp_path / "items.txt")
+    benchmark.write_quest_file(quest_file, 25, chain_length=5)
+    benchmark.write_item_file(item_file, 25)
+
+    quests = game_data.load_quests(quest_file)
+    items = game_data.load_items(item_file)
+
+    assert len(quests) == 25 and len(items) == 25
+    assert quests['quest_6']['prerequisite'] == 'quest_5'
+    assert quest_handler.validate_quest_prerequisites(quests)
+
+def test_run_benchmarks_writes_json(tmp_path):
+    """Test that results are written and can be compared"""
+    output = str(tmp_path / "results.json")
+    results = benchmark.run_benchmarks(sizes=(20,), output=output)
+
+    with open(output) as f:
+        assert json.load(f)['sizes'].keys() == {'20'}
+    assert results['sizes']['20']['load_quests']['peak_bytes'] > 0
+    assert len(benchmark.compare_results(results, results)) == 4
+
+def test_character_access_benchmark_reports_every_path():
+    """Test that the access benchmark measures dict and Character records"""
+    results = benchmark.benchmark_character_access(count=100, battles=5)
+
+    assert set(results['read_ns']) == {'dict', 'character_item', 'character_attribute'}
+    assert set(results['battles_per_sec']) == {'dict', 'character_item'}
+    assert all(ns > 0 for ns in results['write_ns'].values())
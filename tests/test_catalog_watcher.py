@@ -0,0 +1,131 @@
+"""
+Test Catalog Watcher
+Tests hot-reloading of quest and item data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+import catalog_watcher
+
+QUEST_BLOCK = (
+    "QUEST_ID: {qid}\n"
+    "TITLE: {qid}\n"
+    "DESCRIPTION: Quest {qid}\n"
+    "REWARD_XP: {xp}\n"
+    "REWARD_GOLD: 5\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: {prereq}\n"
+)
+
+def write_quests(path, *blocks):
+    path.write_text("\n".join(QUEST_BLOCK.format(**b) for b in blocks))
+    # Make sure the change is visible even on coarse mtime filesystems
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000000000))
+
+@pytest.fixture
+def watched(tmp_path):
+    quest_file = tmp_path / "quests.txt"
+    item_file = tmp_path / "items.txt"
+    write_quests(quest_file,
+                 {'qid': 'a', 'xp': 10, 'prereq': 'NONE'},
+                 {'qid': 'b', 'xp': 20, 'prereq': 'a'})
+    item_file.write_text(open("data/items.txt").read())
+
+    swaps = []
+    watcher = catalog_watcher.CatalogWatcher(
+        lambda quests, items: swaps.append((quests, items)),
+        game_data.load_quests(str(quest_file)),
+        game_data.load_items(str(item_file)),
+        quest_file=str(quest_file), item_file=str(item_file)
+    )
+    return watcher, quest_file, swaps
+
+def test_poll_without_changes(watched):
+    """Test that nothing is reloaded when the files are untouched"""
+    watcher, quest_file, swaps = watched
+
+    assert watcher.poll() is None
+    assert swaps == []
+
+def test_poll_swaps_changed_quests(watched):
+    """Test that an edited quest is reloaded and swapped in"""
+    watcher, quest_file, swaps = watched
+    write_quests(quest_file,
+                 {'qid': 'a', 'xp': 10, 'prereq': 'NONE'},
+                 {'qid': 'b', 'xp': 99, 'prereq': 'a'})
+
+    report = watcher.poll()
+
+    assert report['changed_quests'] == ['b']
+    assert swaps[-1][0]['b']['reward_xp'] == 99
+
+def test_poll_keeps_old_catalog_on_bad_prerequisite(watched):
+    """Test that removing a prerequisite quest is rejected"""
+    watcher, quest_file, swaps = watched
+    write_quests(quest_file, {'qid': 'b', 'xp': 20, 'prereq': 'a'})
+
+    assert watcher.poll() is None
+    assert watcher.last_error is not None
+    assert 'a' in watcher.quests
+    assert swaps == []
+
+def test_failed_item_reload_does_not_drop_quest_edit(watched, tmp_path):
+    """Test that a quest edit is applied once a broken item file is fixed"""
+    watcher, quest_file, swaps = watched
+    item_file = tmp_path / "items.txt"
+    good_items = item_file.read_text()
+
+    write_quests(quest_file,
+                 {'qid': 'a', 'xp': 950, 'prereq': 'NONE'},
+                 {'qid': 'b', 'xp': 20, 'prereq': 'a'})
+    item_file.write_text("ITEM_ID: broken\nNAME: Broken\n")
+
+    assert watcher.poll() is None
+    assert watcher.last_error is not None
+    assert watcher.quests['a']['reward_xp'] == 10
+
+    item_file.write_text(good_items)
+    stat = os.stat(item_file)
+    os.utime(item_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2000000000))
+
+    report = watcher.poll()
+    assert report['changed_quests'] == ['a']
+    assert watcher.quests['a']['reward_xp'] == 950
+    assert watcher.last_error is None
+
+def test_first_reload_reuses_unchanged_records(watched):
+    """Test that the first reload keeps the loaded record objects"""
+    watcher, quest_file, swaps = watched
+    original_a = watcher.quests['a']
+    write_quests(quest_file,
+                 {'qid': 'a', 'xp': 10, 'prereq': 'NONE'},
+                 {'qid': 'b', 'xp': 30, 'prereq': 'a'})
+
+    watcher.poll()
+    assert watcher.quests['a'] is original_a
+
+def test_creating_watcher_parses_nothing(tmp_path, monkeypatch):
+    """Test that a watcher does not re-parse catalogs that were just loaded"""
+    quest_file = tmp_path / "quests.txt"
+    write_quests(quest_file, {'qid': 'a', 'xp': 10, 'prereq': 'NONE'})
+    quests = game_data.load_quests(str(quest_file))
+
+    parsed = []
+    parse = game_data.parse_quest_record
+    monkeypatch.setattr(game_data, "parse_quest_record",
+                        lambda lines: parsed.append(lines) or parse(lines))
+    watcher = catalog_watcher.CatalogWatcher(lambda quests, items: None, quests, {},
+                                             quest_file=str(quest_file),
+                                             item_file=str(tmp_path / "items.txt"))
+    assert parsed == []
+
+    write_quests(quest_file, {'qid': 'a', 'xp': 10, 'prereq': 'NONE'},
+                 {'qid': 'b', 'xp': 20, 'prereq': 'a'})
+    watcher.poll()
+    assert len(parsed) == 2 and watcher.quests['a'] is quests['a']
@@ -0,0 +1,103 @@
+"""
+Test Character Progression
+Tests experience and level-up calculations
+"""
+
+import pytest
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+def gain_experience_by_loop(character, xp_amount):
+    """Original one-level-at-a-time rule, used as the reference"""
+    character['experience'] += xp_amount
+    while character['experience'] >= character['level'] * 100:
+        character['experience'] -= character['level'] * 100
+        character['level'] += 1
+        character['max_health'] += 10
+        character['strength'] += 2
+        character['magic'] += 2
+        character['health'] = character['max_health']
+
+def test_closed_form_matches_loop():
+    """Property test: closed-form leveling equals the original loop"""
+    rng = random.Random(163)
+
+    for _ in range(3000):
+        char = character_manager.create_character("Prop", rng.choice(["Warrior", "Mage"]))
+        char['level'] = rng.randint(1, 300)
+        char['experience'] = rng.randint(0, char['level'] * 100 - 1)
+        char['health'] = rng.randint(1, char['max_health'])
+        xp = rng.choice([0, 1, 99, 100, rng.randint(0, 10 ** 3), rng.randint(0, 10 ** 7)])
+
+        expected = dict(char)
+        gain_experience_by_loop(expected, xp)
+        character_manager.gain_experience(char, xp)
+
+        assert char == expected
+
+def test_exact_level_boundaries():
+    """Test XP amounts that land exactly on level thresholds"""
+    for xp, level in ((99, 1), (100, 2), (299, 2), (300, 3), (600, 4)):
+        char = character_manager.create_character("Edge", "Cleric")
+        character_manager.gain_experience(char, xp)
+        assert char['level'] == level
+
+def test_gain_experience_batch():
+    """Test batched XP awards and that a dead character blocks the batch"""
+    a = character_manager.create_character("A", "Warrior")
+    b = character_manager.create_character("B", "Rogue")
+
+    assert character_manager.gain_experience_batch([(a, 100), (b, 300)]) == [1, 2]
+
+    b['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        character_manager.gain_experience_batch([(a, 1000), (b, 10)])
+    assert a['level'] == 2
+
+# ============================================================================
+# CHARACTER RECORD TESTS
+# ============================================================================
+
+def test_character_record_is_dict_compatible():
+    """Test that Character supports both item and attribute access"""
+    char = character_manager.create_character("Slots", "Mage")
+    assert isinstance(char, character_manager.Character)
+    assert not hasattr(char, '__dict__')
+
+    assert char['class'] == char.character_class == "Mage"
+    char['gold'] += 5
+    assert char.gold == 105
+    assert list(char)[:3] == ['name', 'class', 'level']
+
+    char['equipped_weapon'] = 'iron_sword'
+    assert char.get('equipped_weapon') == 'iron_sword'
+    assert 'equipped_weapon' in char
+    del char['equipped_weapon']
+    assert 'equipped_weapon' not in char
+    with pytest.raises(KeyError):
+        char['missing']
+
+def test_character_health_never_exceeds_max():
+    """Test that health is clamped to max_health"""
+    char = character_manager.create_character("Clamp", "Warrior")
+    char['health'] = char['max_health'] + 50
+    assert char['health'] == char['max_health']
+
+    char.max_health = 40
+    assert char.health == 40
+
+def test_character_survives_save_round_trip(tmp_path):
+    """Test that extra keys survive saving and loading a Character"""
+    char = character_manager.create_character("Trip", "Cleric")
+    char['equipped_armor'] = 'leather_armor'
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Trip", str(tmp_path))
+    assert isinstance(loaded, character_manager.Character)
+    assert loaded == char
@@ -0,0 +1,326 @@
+"""
+Test Combat Simulation
+Tests headless battles with decision policies
+"""
+
+import pytest
+import sys
+import os
+import json
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+import combat_system
+import battle_simulator
+
+# ============================================================================
+# BATTLE POLICY TESTS
+# ============================================================================
+
+def test_quiet_battle_prints_nothing(capsys):
+    """Test that a quiet scripted battle runs without output or input"""
+    char = character_manager.create_character("Quiet", "Warrior")
+    enemy = combat_system.create_enemy("goblin")
+    battle = combat_system.SimpleBattle(
+        char, enemy, policy=combat_system.ScriptedPolicy([]), quiet=True
+    )
+
+    result = battle.start_battle()
+    assert result['winner'] == 'player'
+    assert result['xp_gained'] == enemy['xp_reward']
+    assert result['turns'] >= 1
+    assert capsys.readouterr().out == ""
+
+def test_scripted_actions_follow_the_rules():
+    """Test that scripted actions use the same damage rules as the CLI"""
+    char = character_manager.create_character("Script", "Mage")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(
+        char, enemy, policy=combat_system.ScriptedPolicy(["dance", combat_system.SPECIAL]),
+        quiet=True
+    )
+
+    battle.player_turn()   # invalid action: the turn is lost
+    assert enemy['health'] == 80
+    battle.player_turn()
+    assert enemy['health'] == 80 - char['magic'] * 2
+    battle.player_turn()   # script exhausted: basic attack
+    assert enemy['health'] == 80 - char['magic'] * 2 - battle.calculate_damage(char, enemy)
+
+def test_escape_ends_battle(monkeypatch):
+    """Test that a successful escape ends the battle instead of raising"""
+    monkeypatch.setattr(random, "random", lambda: 0.0)
+    char = character_manager.create_character("Runner", "Rogue")
+    battle = combat_system.SimpleBattle(
+        char, combat_system.create_enemy("dragon"),
+        policy=combat_system.ScriptedPolicy([combat_system.ESCAPE]), quiet=True
+    )
+
+    assert battle.start_battle() == {'winner': 'escaped', 'xp_gained': 0,
+                                     'gold_gained': 0, 'turns': 1}
+
+def test_policies_must_choose_actions():
+    """Test that BattlePolicy is abstract and needs choose_action"""
+    class Idle(combat_system.BattlePolicy):
+        pass
+
+    with pytest.raises(TypeError):
+        combat_system.BattlePolicy()
+    with pytest.raises(TypeError):
+        Idle()
+
+def test_greedy_cleric_heals_before_fatal_hit():
+    """Test that the greedy policy heals only when it saves the Cleric"""
+    char = character_manager.create_character("Greedy", "Cleric")
+    enemy = combat_system.create_enemy("orc")
+    battle = combat_system.SimpleBattle(char, enemy, policy=combat_system.GreedyPolicy(), quiet=True)
+
+    assert battle.policy.choose_action(battle) == combat_system.ATTACK
+    char['health'] = battle.calculate_damage(enemy, char)
+    assert battle.policy.choose_action(battle) == combat_system.SPECIAL
+
+def test_character_battle_matches_dict_battle():
+    """Test that a Character fights like its dict copy and keeps the result"""
+    char = character_manager.create_character("Record", "Cleric")
+    copy = dict(char)
+
+    results = []
+    for player in (char, copy):
+        battle = combat_system.SimpleBattle(player, combat_system.create_enemy("dragon"),
+                                            policy=combat_system.GreedyPolicy(), quiet=True,
+                                            rng=combat_system.battle_rng(4, 0))
+        results.append(battle.start_battle())
+        assert battle.character is player
+
+    assert results[0] == results[1]
+    assert isinstance(char, character_manager.Character)
+    assert char['health'] == copy['health'] < char['max_health']
+
+def test_many_headless_battles():
+    """Test that thousands of random-policy battles resolve headless"""
+    rng = random.Random(21)
+    winners = set()
+
+    for i in range(2000):
+        char = character_manager.create_character(f"Sim{i}", rng.choice(["Warrior", "Mage", "Rogue", "Cleric"]))
+        enemy = combat_system.create_enemy(rng.choice(["goblin", "orc", "dragon"]))
+        battle = combat_system.SimpleBattle(
+            char, enemy, policy=combat_system.RandomPolicy(rng=rng), quiet=True
+        )
+        winners.add(battle.start_battle()['winner'])
+
+    assert winners == {'player', 'enemy', 'escaped'}
+
+# ============================================================================
+# BATTLE SIMULATOR TESTS
+# ============================================================================
+
+def test_simulator_reports_every_combination():
+    """Test that the simulator covers each combination and is seed-stable"""
+    kwargs = dict(battles=60, classes=["Warrior", "Rogue"], levels=[1], enemies=["orc"],
+                  policies=["greedy", "random"], seed=7, chunk_size=25)
+    rows = battle_simulator.simulate(max_workers=2, **kwargs)
+
+    assert [(row['class'], row['policy']) for row in rows] == [
+        ("Warrior", "greedy"), ("Warrior", "random"), ("Rogue", "greedy"), ("Rogue", "random")
+    ]
+    for row in rows:
+        assert row['battles'] == 60
+        assert row['win_rate_low'] <= row['win_rate'] <= row['win_rate_high']
+    assert rows[0]['win_rate'] == 1.0 and rows[0]['turns_ci'] == 0.0
+
+    assert battle_simulator.simulate(max_workers=1, **kwargs) == rows
+
+def test_simulator_levels_and_output(tmp_path):
+    """Test leveled characters and CSV/JSON output"""
+    character = battle_simulator.make_character("Mage", 4)
+    assert character['level'] == 4 and character['experience'] == 0
+
+    rows = battle_simulator.simulate(battles=5, classes=["Mage"], levels=[4],
+                                     enemies=["goblin"], policies=["attack"], max_workers=1)
+    battle_simulator.write_results(rows, str(tmp_path / "out.csv"))
+    battle_simulator.write_results(rows, str(tmp_path / "out.json"))
+
+    assert (tmp_path / "out.csv").read_text().startswith("class,level,enemy,policy")
+    assert len(json.loads((tmp_path / "out.json").read_text())) == 1
+
+    with pytest.raises(ValueError):
+        battle_simulator.simulate(battles=1, policies=["cheat"])
+    with pytest.raises(ValueError):
+        battle_simulator.simulate(battles=0, classes=["Mage"], levels=[1],
+                                  enemies=["goblin"], policies=["attack"], max_workers=1)
+
+def test_numpy_engine_requires_numpy(monkeypatch):
+    """Test that the NumPy engine fails up front when NumPy is missing"""
+    monkeypatch.setattr(battle_simulator, "numpy", None)
+    with pytest.raises(ImportError):
+        battle_simulator.simulate(battles=5, classes=["Mage"], levels=[1], enemies=["goblin"],
+                                  policies=["attack"], max_workers=1, engine="numpy")
+
+# ============================================================================
+# VECTORIZED ENGINE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("character_class,enemy,policy", [
+    ("Warrior", "goblin", "greedy"),
+    ("Cleric", "dragon", "greedy"),
+    ("Mage", "orc", "attack"),
+])
+def test_batch_engine_matches_deterministic_battles(character_class, enemy, policy):
+    """Test that battles without random rolls come out identical"""
+    pytest.importorskip("numpy")
+    kwargs = dict(battles=20, classes=[character_class], levels=[2], enemies=[enemy],
+                  policies=[policy], max_workers=1)
+    assert (battle_simulator.simulate(engine="numpy", **kwargs)
+            == battle_simulator.simulate(engine="python", **kwargs))
+
+def test_batch_engine_matches_simple_battle_statistically():
+    """Test that win rate, turns and HP agree with SimpleBattle within sampling error"""
+    pytest.importorskip("numpy")
+    kwargs = dict(battles=2000, classes=["Rogue", "Warrior", "Cleric"], levels=[1, 4],
+                  enemies=["orc", "dragon"], policies=["greedy", "random"], max_workers=1)
+    python_rows = battle_simulator.simulate(engine="python", seed=1, **kwargs)
+    numpy_rows = battle_simulator.simulate(engine="numpy", seed=2, chunk_size=2000, **kwargs)
+
+    for a, b in zip(python_rows, numpy_rows):
+        n = a['battles']
+        win_error = 4 * (2 * max(a['win_rate'] * (1 - a['win_rate']), 1 / n) / n) ** 0.5
+        assert abs(a['win_rate'] - b['win_rate']) <= win_error, a
+        assert abs(a['escape_rate'] - b['escape_rate']) <= 0.05, a
+        assert abs(a['mean_turns'] - b['mean_turns']) <= 2 * (a['turns_ci'] + b['turns_ci']) + 1e-9, a
+        assert abs(a['mean_hp_remaining'] - b['mean_hp_remaining']) <= 2 * (a['hp_ci'] + b['hp_ci']) + 1e-9, a
+
+def test_batch_engine_rejects_dead_character():
+    """Test that the batch engine follows SimpleBattle's dead-character rule"""
+    pytest.importorskip("numpy")
+    char = character_manager.create_character("Ghost", "Mage")
+    char['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        battle_simulator.batch_battles(char, combat_system.create_enemy("goblin"))
+
+# ============================================================================
+# OUTCOME SOLVER TESTS
+# ============================================================================
+
+def test_solver_closed_form_matches_simple_battle():
+    """Test the O(1) answer against actually fighting deterministic battles"""
+    for character_class in ("Warrior", "Mage", "Rogue", "Cleric"):
+        for enemy_type in ("goblin", "orc", "dragon"):
+            for level in (1, 2, 5):
+                char = battle_simulator.make_character(character_class, level)
+                enemy = combat_system.create_enemy(enemy_type)
+                solution = combat_system.solve_battle(char, enemy, "attack")
+
+                battle = combat_system.SimpleBattle(
+                    char, enemy, policy=combat_system.ScriptedPolicy([]), quiet=True
+                )
+                result = battle.start_battle()
+                assert solution['outcomes'] == {
+                    (result['winner'], char['health'], enemy['health'], result['turns']): 1.0
+                }
+
+def test_solver_distribution_for_rogue_crits():
+    """Test the exact distribution when Critical Strike can miss its crit"""
+    char = character_manager.create_character("Crit", "Rogue")   # strength 12
+    enemy = combat_system.create_enemy("goblin")                  # 50 health
+    solution = combat_system.solve_battle(char, enemy, "greedy")
+
+    # 36+36 kills in 2 turns; otherwise a third (or fourth) strike is needed
+    assert sum(solution['outcomes'].values()) == pytest.approx(1.0)
+    assert solution['win'] == pytest.approx(1.0)
+    turns = {}
+    for (_, _, _, t), p in solution['outcomes'].items():
+        turns[t] = turns.get(t, 0) + p
+    assert turns[2] == pytest.approx(0.25)
+
+def test_solver_reports_unresolved_probability(monkeypatch):
+    """Test that a turn limit leaves the unfinished probability visible"""
+    char = character_manager.create_character("Slow", "Cleric")
+    enemy = combat_system.create_enemy("dragon")
+    full = combat_system.solve_battle(char, enemy, "random")
+    assert full['unresolved'] < combat_system.SOLVER_TOLERANCE
+
+    monkeypatch.setattr(combat_system, "SOLVER_MAX_TURNS", 2)
+    cut = combat_system.solve_battle(char, enemy, "random")
+    assert cut['unresolved'] > 0.1
+    assert cut['win'] + cut['loss'] + cut['escape'] + cut['unresolved'] == pytest.approx(1.0)
+    assert max(turns for (_, _, _, turns) in cut['outcomes']) <= 2
+
+    row = battle_simulator.exact_row(("Cleric", 1, "dragon", "random"))
+    assert row['win_rate_high'] == pytest.approx(row['win_rate'] + cut['unresolved'])
+
+def test_solver_matches_simulation_with_escapes():
+    """Test solved win/escape rates against the simulator for random play"""
+    rows = battle_simulator.simulate(battles=4000, classes=["Cleric", "Rogue"], levels=[2],
+                                     enemies=["orc"], policies=["random"], seed=5, max_workers=1)
+    exact = battle_simulator.simulate(classes=["Cleric", "Rogue"], levels=[2],
+                                      enemies=["orc"], policies=["random"], engine="exact")
+
+    for sampled, solved in zip(rows, exact):
+        assert solved['win_rate_low'] == solved['win_rate'] == solved['win_rate_high']
+        assert sampled['win_rate_low'] <= solved['win_rate'] <= sampled['win_rate_high']
+        assert abs(sampled['escape_rate'] - solved['escape_rate']) < 0.03
+        assert abs(sampled['mean_turns'] - solved['mean_turns']) < 3 * sampled['turns_ci']
+
+def test_fast_forward_applies_end_state():
+    """Test that fast-forward sets health from a drawn outcome"""
+    char = character_manager.create_character("Fast", "Warrior")
+    enemy = combat_system.create_enemy("orc")
+    result = combat_system.fast_forward_battle(char, enemy, rng=random.Random(1))
+
+    assert result == {'winner': 'player', 'xp_gained': 50, 'gold_gained': 25, 'turns': 3}
+    assert enemy['health'] == 0
+    assert char['health'] == 120 - 2 * (12 - 15 // 4)
+
+    char['health'] = 0
+    with pytest.raises(CharacterDeadError):
+        combat_system.fast_forward_battle(char, combat_system.create_enemy("goblin"))
+
+# ============================================================================
+# RANDOM STREAM TESTS
+# ============================================================================
+
+def test_battle_streams_are_reproducible_and_independent():
+    """Test that battle_rng streams depend only on the seed and key"""
+    first = [combat_system.battle_rng(42, 0, 7).random() for _ in range(3)]
+    assert first == [combat_system.battle_rng(42, 0, 7).random() for _ in range(3)]
+    assert combat_system.battle_rng(42, 0, 8).random() != first[0]
+    assert combat_system.battle_rng(43, 0, 7).random() != first[0]
+
+def test_seeded_battle_replays_exactly():
+    """Test that one stream drives the policy, crits and escapes of a battle"""
+    def fight():
+        char = character_manager.create_character("Replay", "Rogue")
+        rng = combat_system.battle_rng(9, 1)
+        battle = combat_system.SimpleBattle(char, combat_system.create_enemy("dragon"),
+                                            policy=combat_system.RandomPolicy(), quiet=True, rng=rng)
+        return battle.start_battle(), char['health']
+
+    assert fight() == fight()
+
+def test_sharded_simulation_is_bit_for_bit_reproducible():
+    """Test that worker count and chunk size do not change simulated results"""
+    kwargs = dict(battles=90, classes=["Rogue", "Cleric"], levels=[2], enemies=["orc"],
+                  policies=["random", "greedy"], seed=11)
+    reference = battle_simulator.simulate(max_workers=1, chunk_size=90, **kwargs)
+
+    assert battle_simulator.simulate(max_workers=2, chunk_size=7, **kwargs) == reference
+    assert battle_simulator.simulate(max_workers=1, chunk_size=90,
+                                     **dict(kwargs, seed=12)) != reference
+
+@pytest.mark.parametrize("engine", ["python", "numpy"])
+def test_combination_results_do_not_depend_on_the_grid(engine):
+    """Test that a combination simulates the same alone and inside a larger grid"""
+    if engine == "numpy":
+        pytest.importorskip("numpy")
+    kwargs = dict(battles=40, levels=[2], seed=3, chunk_size=40, max_workers=1, engine=engine)
+    alone = battle_simulator.simulate(classes=["Cleric"], enemies=["dragon"],
+                                      policies=["random"], **kwargs)
+    grid = battle_simulator.simulate(classes=["Rogue", "Cleric"], enemies=["orc", "dragon"],
+                                     policies=["greedy", "random"], **kwargs)
+
+    assert [row for row in grid if (row['class'], row['enemy'], row['policy'])
+            == ("Cleric", "dragon", "random")] == alone
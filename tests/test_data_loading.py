@@ -0,0 +1,306 @@
+"""
+Test Data Loading
+Tests streaming, caching and catalog loading in game_data
+"""
+
+import pytest
+import sys
+import os
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import game_data
+import symbols
+
+QUEST_TEXT = (
+    "QUEST_ID: first\n"
+    "TITLE: First\n"
+    "DESCRIPTION: The first quest\n"
+    "REWARD_XP: 10\n"
+    "REWARD_GOLD: 5\n"
+    "REQUIRED_LEVEL: 1\n"
+    "PREREQUISITE: NONE\n"
+    "\n"
+    "\n"
+    "QUEST_ID: second\n"
+    "TITLE: Second\n"
+    "DESCRIPTION: The second quest\n"
+    "REWARD_XP: 20\n"
+    "REWARD_GOLD: 10\n"
+    "REQUIRED_LEVEL: 2\n"
+    "PREREQUISITE: first"
+)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_streams_blocks(tmp_path):
+    """Test that iter_quests yields one validated quest per block"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    quests = list(game_data.iter_quests(str(path)))
+
+    assert [q['quest_id'] for q in quests] == ['first', 'second']
+    assert quests[1]['reward_xp'] == 20
+    assert game_data.load_quests(str(path)) == {q['quest_id']: q for q in quests}
+
+def test_iter_items_matches_load_items():
+    """Test that load_items is built on iter_items"""
+    items = list(game_data.iter_items("data/items.txt"))
+
+    assert len(items) == len(game_data.load_items("data/items.txt"))
+
+def test_iter_quests_empty_file(tmp_path):
+    """Test that an empty file still raises InvalidDataFormatError"""
+    path = tmp_path / "quests.txt"
+    path.write_text("\n\n")
+
+    with pytest.raises(InvalidDataFormatError):
+        list(game_data.iter_quests(str(path)))
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_compiled_cache_round_trip(tmp_path):
+    """Test that a warm load returns the compiled snapshot"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+
+    cold = game_data.load_quests(str(path), use_cache=True)
+
+    assert os.path.exists(game_data.get_cache_path(str(path)))
+    assert game_data.load_compiled(str(path)) == cold
+    assert game_data.load_quests(str(path), use_cache=True) == cold
+
+def test_compiled_cache_invalidated_by_edit(tmp_path):
+    """Test that editing the source file invalidates the snapshot"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT)
+    game_data.load_quests(str(path), use_cache=True)
+
+    path.write_text(QUEST_TEXT.replace("REWARD_XP: 20", "REWARD_XP: 99"))
+
+    assert game_data.load_compiled(str(path)) is None
+    assert game_data.load_quests(str(path), use_cache=True)['second']['reward_xp'] == 99
+
+def test_compiled_cache_missing_file(tmp_path):
+    """Test that a missing data file raises MissingDataFileError with use_cache"""
+    missing = str(tmp_path / "missing.txt")
+
+    with pytest.raises(MissingDataFileError):
+        game_data.load_quests(missing, use_cache=True)
+    with pytest.raises(MissingDataFileError):
+        game_data.load_items(missing, use_cache=True)
+    with pytest.raises(MissingDataFileError):
+        game_data.compile_data_files(missing, missing)
+
+# ============================================================================
+# LAZY ITEM CATALOG TESTS
+# ============================================================================
+
+def test_item_catalog_matches_load_items():
+    """Test that the lazy catalog returns the same items as load_items"""
+    items = game_data.load_items("data/items.txt")
+
+    with game_data.ItemCatalog("data/items.txt", cache_size=2) as catalog:
+        assert len(catalog) == len(items)
+        assert "iron_sword" in catalog
+        assert "missing_item" not in catalog
+        assert catalog.get("missing_item", {}) == {}
+        assert dict(catalog.items()) == items
+        assert len(catalog._cache) == 2
+
+def test_item_catalog_missing_file():
+    """Test that a missing item file raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.ItemCatalog("data/no_such_items.txt")
+
+# ============================================================================
+# RECORD TYPE TESTS
+# ============================================================================
+
+def test_loaders_return_slotted_records(tmp_path):
+    """Test that loaded quests are slotted records with dict-style access"""
+    path = tmp_path / "quests.txt"
+    path.write_text(QUEST_TEXT + "\nREWARD_ITEMS: potion")
+
+    quest = game_data.load_quests(str(path))['second']
+
+    assert isinstance(quest, game_data.Quest)
+    assert not hasattr(quest, '__dict__')
+    assert quest['prerequisite'] == 'first'
+    assert quest.get('reward_items') == 'potion'
+    assert 'missing' not in quest
+    assert dict(quest)['reward_gold'] == 10
+
+def test_compiled_cache_keeps_record_type(tmp_path):
+    """Test that warm loads rebuild the same record type"""
+    path = tmp_path / "items.txt"
+    path.write_text(open("data/items.txt").read())
+
+    cold = game_data.load_items(str(path), use_cache=True)
+    warm = game_data.load_items(str(path), use_cache=True)
+
+    assert isinstance(warm['iron_sword'], game_data.Item)
+    assert warm == cold
+
+# ============================================================================
+# COLUMNAR ITEM VIEW TESTS
+# ============================================================================
+
+def test_item_columns_queries():
+    """Test vectorized shop queries against the real item file"""
+    pytest.importorskip("numpy")
+    items = game_data.load_items("data/items.txt")
+    columns = game_data.build_item_columns(items)
+
+    affordable = columns.affordable(75)
+    assert affordable == [i for i, item in items.items() if item['cost'] <= 75]
+    assert columns.cheapest('weapon', 'strength') == 'iron_sword'
+    assert columns.cheapest('armor', 'strength') is None
+    assert columns.top_k(1) == ['steel_sword']
+    assert set(columns.top_k(3)) == {'steel_sword', 'fire_staff', 'steel_armor'}
+    assert columns.top_k(1, key='max_health', item_type='armor') == ['steel_armor']
+
+def test_item_columns_invalid_type():
+    """Test that unknown item types raise InvalidItemTypeError"""
+    pytest.importorskip("numpy")
+    columns = game_data.ItemColumns(game_data.load_items("data/items.txt"))
+
+    with pytest.raises(InvalidItemTypeError):
+        columns.affordable(100, item_type='ring')
+
+# ============================================================================
+# SCHEMA PARSER TESTS
+# ============================================================================
+
+def test_fused_parser_matches_separate_functions():
+    """Test that the fused item parser agrees with parse + validate"""
+    lines = ["ITEM_ID: club", "NAME: Club", "TYPE: weapon",
+             "EFFECT: strength:1", "COST: 5", "DESCRIPTION: A club"]
+
+    item = game_data.parse_item_record(lines)
+    item_data = game_data.parse_item_block(lines)
+    game_data.validate_item_data(item_data)
+
+    assert item == item_data
+    assert item['cost'] == 5
+
+@pytest.mark.parametrize("bad_line", [
+    "TYPE: ring",
+    "COST: cheap",
+    "DESCRIPTION without separator",
+])
+def test_fused_parser_rejects_bad_fields(bad_line):
+    """Test that enum, integer and format errors raise InvalidDataFormatError"""
+    lines = ["ITEM_ID: club", "NAME: Club", "TYPE: weapon",
+             "EFFECT: strength:1", "COST: 5", bad_line]
+
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_item_record(lines)
+
+def test_fused_parser_missing_field():
+    """Test that a missing required field is reported"""
+    with pytest.raises(InvalidDataFormatError, match="description"):
+        game_data.parse_quest_record(["QUEST_ID: q", "TITLE: Q"])
+
+# ============================================================================
+# SHARDED DIRECTORY TESTS
+# ============================================================================
+
+def test_load_quest_shards_merges_files(tmp_path):
+    """Test that shards are parsed in parallel and merged"""
+    first, second = QUEST_TEXT.split("\n\n\n")
+    (tmp_path / "east.txt").write_text(first)
+    (tmp_path / "west.txt").write_text(second)
+
+    quests = game_data.load_quest_shards(str(tmp_path), max_workers=2)
+
+    assert set(quests) == {'first', 'second'}
+    assert isinstance(quests['second'], game_data.Quest)
+
+def test_load_quest_shards_duplicate_id(tmp_path):
+    """Test that a quest ID repeated across shards is rejected"""
+    (tmp_path / "east.txt").write_text(QUEST_TEXT)
+    (tmp_path / "west.txt").write_text(QUEST_TEXT)
+
+    with pytest.raises(InvalidDataFormatError, match="Duplicate quest ID"):
+        game_data.load_quest_shards(str(tmp_path), max_workers=2)
+
+def test_load_item_shards_empty_directory(tmp_path):
+    """Test that a directory without shards raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        game_data.load_item_shards(str(tmp_path))
+
+# ============================================================================
+# SYMBOL TABLE TESTS
+# ============================================================================
+
+def test_loaders_share_repeated_values():
+    """Test that repeated type/prerequisite values are the same object"""
+    items = list(game_data.load_items("data/items.txt").values())
+    weapons = [item for item in items if item['type'] == 'weapon']
+
+    assert weapons[0]['type'] is weapons[1]['type']
+
+    first = game_data.parse_quest_record(QUEST_TEXT.split("\n")[:7])
+    again = game_data.parse_quest_record(QUEST_TEXT.split("\n")[:7])
+    assert first['prerequisite'] is again['prerequisite']
+
+def test_symbol_table_reports_savings():
+    """Test that interning counts hits and bytes saved"""
+    table = symbols.SymbolTable()
+    ids = table.intern_list(["".join(["iron", "_sword"]), "".join(["iron", "_sword"])])
+
+    assert ids[0] is ids[1]
+    assert table.stats()['symbols'] == 1
+    assert table.stats()['hits'] == 1
+    assert table.stats()['bytes_saved'] > 0
+
+def test_symbol_table_is_bounded():
+    """Test that the least recently used symbol is dropped when the table is full"""
+    table = symbols.SymbolTable(max_symbols=2)
+    kept = table.intern("".join(["iron", "_sword"]))
+    table.intern("steel_sword")
+    table.intern(kept)
+    table.intern("wooden_staff")
+
+    assert len(table) == 2 and table.stats()['evicted'] == 1
+    assert table.intern("".join(["iron", "_sword"])) is kept
+    assert game_data.SYMBOLS is symbols.SYMBOLS
+
+def test_full_symbol_table_is_thread_safe():
+    """Test that concurrent interning with constant eviction never fails"""
+    from concurrent.futures import ThreadPoolExecutor
+    table = symbols.SymbolTable(max_symbols=4)
+
+    def churn(offset):
+        for i in range(2000):
+            table.intern(f"id_{(i + offset) % 9}")
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert all(pool.map(churn, range(8)))
+    assert len(table) == 4
+
+def test_effect_stat_names_are_shared():
+    """Test that parsed effect stat names are interned"""
+    from inventory_system import parse_effect_string
+    first = parse_effect_string("".join(["stren", "gth:5"]))
+    second = parse_effect_string("strength:2,health:10")
+
+    assert next(iter(first)) is next(iter(second))
+
+def test_character_manager_does_not_import_game_data():
+    """Test that the symbol table keeps game_data (and NumPy) out of character_manager"""
+    code = ("import sys, character_manager; "
+            "print('game_data' in sys.modules, 'numpy' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                            check=True).stdout
+    assert output.split() == ["False", "False"]
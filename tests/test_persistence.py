@@ -0,0 +1,430 @@
+"""
+Test Persistence
+Tests character save formats and storage
+"""
+
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from custom_exceptions import *
+import character_manager
+
+# ============================================================================
+# SAVE CODEC TESTS
+# ============================================================================
+
+def test_json_save_round_trip(tmp_path):
+    """Test that the versioned format keeps lists, including empty ones"""
+    char = character_manager.create_character("CodecHero", "Rogue")
+    char['inventory'] = ['iron_sword', 'health_potion']
+    character_manager.save_character(char, str(tmp_path))
+
+    with open(tmp_path / "CodecHero_save.txt") as f:
+        assert f.readline().startswith("QCSAVE 1 json")
+
+    loaded = character_manager.load_character("CodecHero", str(tmp_path))
+    assert loaded == char
+    assert loaded['active_quests'] == []
+
+def test_legacy_save_still_loads(tmp_path):
+    """Test that legacy text saves, including empty list fields, load"""
+    char = character_manager.create_character("OldHero", "Mage")
+    char['completed_quests'] = ['first_steps']
+    character_manager.save_character(char, str(tmp_path), character_manager.SAVE_FORMAT_LEGACY)
+
+    assert character_manager.load_character("OldHero", str(tmp_path)) == char
+
+    (tmp_path / "Upper_save.txt").write_text("NAME: Upper\nGOLD: 5\nINVENTORY: \n")
+    loaded = character_manager.load_character("Upper", str(tmp_path))
+    assert loaded == {'name': 'Upper', 'gold': 5, 'inventory': []}
+
+def test_legacy_save_never_evaluates_code(tmp_path):
+    """Test that list values are parsed as literals, not executed"""
+    (tmp_path / "Evil_save.txt").write_text("inventory: [__import__('os')]\n")
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Evil", str(tmp_path))
+
+def test_unknown_save_version(tmp_path):
+    """Test that a future save version is rejected"""
+    (tmp_path / "Future_save.txt").write_text("QCSAVE 99 json\n{}\n")
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("Future", str(tmp_path))
+
+# ============================================================================
+# SAVE JOURNAL TESTS
+# ============================================================================
+
+def test_journaled_saves_append_deltas(tmp_path):
+    """Test that journaled saves append only changed fields and replay on load"""
+    char = character_manager.create_character("JournalHero", "Cleric")
+    character_manager.save_character(char, str(tmp_path), journal=True)
+
+    char['gold'] = 250
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    character_manager.save_character(char, str(tmp_path), journal=True)  # unchanged
+
+    with open(tmp_path / "JournalHero_save.journal") as f:
+        lines = f.readlines()
+    assert lines == ['{"gold":250}\n']
+    assert character_manager.load_character("JournalHero", str(tmp_path)) == char
+
+def test_journal_compaction(tmp_path, monkeypatch):
+    """Test that the journal is folded into the snapshot periodically"""
+    monkeypatch.setattr(character_manager, "JOURNAL_COMPACT_EVERY", 3)
+    char = character_manager.create_character("CompactHero", "Warrior")
+
+    for gold in range(100, 104):
+        char['gold'] = gold
+        character_manager.save_character(char, str(tmp_path), journal=True)
+
+    assert not os.path.exists(tmp_path / "CompactHero_save.journal")
+    assert character_manager.load_character("CompactHero", str(tmp_path))['gold'] == 103
+
+def test_journal_ignores_torn_last_line(tmp_path):
+    """Test that a half-written journal entry is skipped on load"""
+    char = character_manager.create_character("TornHero", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    (tmp_path / "TornHero_save.journal").write_text('{"gold":5}\n{"gold":9')
+
+    assert character_manager.load_character("TornHero", str(tmp_path))['gold'] == 5
+    character_manager.delete_character("TornHero", str(tmp_path))
+    assert not os.path.exists(tmp_path / "TornHero_save.journal")
+
+# ============================================================================
+# STORAGE BACKEND TESTS
+# ============================================================================
+
+def test_sqlite_backend_selected_by_path(tmp_path):
+    """Test that a .db save_directory stores characters in SQLite"""
+    db_path = str(tmp_path / "saves.db")
+    char = character_manager.create_character("SqlHero", "Warrior")
+    char['inventory'] = ['iron_sword']
+
+    assert character_manager.save_character(char, db_path)
+    assert isinstance(character_manager.get_backend(db_path), character_manager.SQLiteBackend)
+    assert character_manager.load_character("SqlHero", db_path) == char
+    assert character_manager.list_saved_characters(db_path) == ["SqlHero"]
+
+    character_manager.delete_character("SqlHero", db_path)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SqlHero", db_path)
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.delete_character("SqlHero", db_path)
+
+def test_sqlite_backend_rejects_file_only_options(tmp_path):
+    """Test that legacy and journaled saves are refused instead of ignored"""
+    backend = character_manager.SQLiteBackend(str(tmp_path / "options.db"))
+    char = character_manager.create_character("Strict", "Rogue")
+
+    with pytest.raises(ValueError):
+        backend.save(char, save_format=character_manager.SAVE_FORMAT_LEGACY)
+    with pytest.raises(ValueError):
+        backend.save(char, journal=True)
+    assert not character_manager.save_character(char, backend, journal=True)
+    assert backend.list_names() == []
+
+    with pytest.raises(TypeError):
+        character_manager.StorageBackend()
+    backend.close()
+
+def test_bulk_sqlite_saves_use_one_batch(tmp_path, monkeypatch):
+    """Test that save_characters sends SQLite saves through save_many"""
+    backend = character_manager.SQLiteBackend(str(tmp_path / "bulk.db"))
+    chars = [character_manager.create_character(f"Batch{i}", "Warrior") for i in range(4)]
+    batches = []
+    save_many = backend.save_many
+    monkeypatch.setattr(backend, "save_many", lambda c: batches.append(len(c)) or save_many(c))
+    character_manager.reset_save_stats()
+
+    saved, errors = character_manager.save_characters(chars, backend)
+    assert len(saved) == 4 and errors == {} and batches == [4]
+    assert character_manager.save_stats()['bytes_written'] > 0
+
+    chars[0]['gold'] = 1
+    character_manager.save_characters(chars, backend)
+    assert batches == [4, 1]
+    assert character_manager.save_stats()['skipped'] == 3
+    assert character_manager.load_character("Batch0", backend)['gold'] == 1
+    backend.close()
+
+def test_flat_file_only_functions_reject_sqlite(tmp_path):
+    """Test that journal, manifest and archive functions refuse a database"""
+    db_path = str(tmp_path / "flat.db")
+    with pytest.raises(ValueError):
+        character_manager.compact_journal("Nobody", db_path)
+    with pytest.raises(ValueError):
+        character_manager.rebuild_manifest(db_path)
+    with pytest.raises(ValueError):
+        character_manager.archive_characters(db_path)
+    assert not os.path.exists(db_path)
+
+def test_sqlite_backend_batched_save(tmp_path):
+    """Test that save_many writes a batch in one call"""
+    backend = character_manager.SQLiteBackend(str(tmp_path / "batch.db"))
+    chars = [character_manager.create_character(f"Hero{i}", "Mage") for i in range(5)]
+
+    backend.save_many(chars)
+
+    assert backend.list_names() == [f"Hero{i}" for i in range(5)]
+    assert character_manager.load_character("Hero3", backend)['class'] == "Mage"
+    backend.close()
+
+# ============================================================================
+# MANIFEST TESTS
+# ============================================================================
+
+def test_manifest_tracks_saves_and_deletes(tmp_path):
+    """Test that save/delete keep the manifest current"""
+    for name, level in (("Ann", 3), ("Bob", 1), ("Cat", 2)):
+        char = character_manager.create_character(name, "Rogue")
+        char['level'] = level
+        character_manager.save_character(char, str(tmp_path))
+    character_manager.delete_character("Bob", str(tmp_path))
+
+    manifest = character_manager.read_manifest(str(tmp_path))
+    assert set(manifest) == {"Ann", "Cat"}
+    assert manifest["Ann"]['class'] == "Rogue"
+
+    by_level = character_manager.list_characters(str(tmp_path), sort_by="level", reverse=True)
+    assert [entry['name'] for entry in by_level] == ["Ann", "Cat"]
+    page = character_manager.list_characters(str(tmp_path), offset=1, limit=1)
+    assert [entry['name'] for entry in page] == ["Cat"]
+
+def test_rebuild_manifest_repairs_directory(tmp_path):
+    """Test that the repair command indexes files added by hand"""
+    character_manager.save_character(character_manager.create_character("Dee", "Mage"), str(tmp_path))
+    (tmp_path / "Eve_save.txt").write_text("name: Eve\nclass: Cleric\nlevel: 4\n")
+    assert "Eve" not in character_manager.list_saved_characters(str(tmp_path))
+
+    entries = character_manager.rebuild_manifest(str(tmp_path))
+
+    assert entries["Eve"]['level'] == 4
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["Dee", "Eve"]
+
+def test_list_characters_sqlite(tmp_path):
+    """Test sorted listing from the SQLite backend"""
+    db_path = str(tmp_path / "list.db")
+    for name in ("Zed", "Amy"):
+        character_manager.save_character(character_manager.create_character(name, "Warrior"), db_path)
+
+    assert [e['name'] for e in character_manager.list_characters(db_path)] == ["Amy", "Zed"]
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+def test_cache_hits_and_skips_clean_writes(tmp_path):
+    """Test that repeated gets hit the cache and clean entries are not saved"""
+    character_manager.save_character(character_manager.create_character("Ivy", "Mage"), str(tmp_path))
+    cache = character_manager.CharacterCache(str(tmp_path))
+
+    first = cache.get("Ivy")
+    assert cache.get("Ivy") is first
+    assert cache.flush() == 0
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['writes']) == (1, 1, 0)
+
+def test_cache_writes_back_dirty_on_eviction(tmp_path):
+    """Test that a mutated character is written when evicted"""
+    for name in ("Jo", "Kim"):
+        character_manager.save_character(character_manager.create_character(name, "Rogue"), str(tmp_path))
+    cache = character_manager.CharacterCache(str(tmp_path), max_characters=1)
+
+    character_manager.add_gold(cache.get("Jo"), 50)
+    assert cache.is_dirty("Jo")
+    cache.get("Kim")   # evicts Jo
+
+    assert "Jo" not in cache
+    assert cache.stats()['evictions'] == 1
+    assert character_manager.load_character("Jo", str(tmp_path))['gold'] == 150
+
+def test_cache_counts_only_real_writes(tmp_path):
+    """Test that a forced flush of an unchanged character is not counted as a write"""
+    character_manager.save_character(character_manager.create_character("Lea", "Cleric"), str(tmp_path))
+    cache = character_manager.CharacterCache(str(tmp_path), max_bytes=10 ** 6)
+    cache.get("Lea")
+    size = cache.stats()['bytes']
+    character_manager.reset_save_stats()
+
+    cache.mark_dirty("Lea")
+    assert cache.flush() == 0
+    assert (cache.stats()['writes'], character_manager.save_stats()['skipped']) == (0, 1)
+
+    cache.get("Lea")['inventory'].append('health_potion')
+    assert cache.is_dirty("Lea") and cache.flush() == 1
+    assert cache.stats()['writes'] == 1 and cache.stats()['bytes'] > size
+    assert not cache.is_dirty("Lea")
+
+# ============================================================================
+# BULK LOAD / SAVE TESTS
+# ============================================================================
+
+def test_bulk_save_and_load_report_errors(tmp_path):
+    """Test that bulk I/O returns per-character results and errors"""
+    chars = [character_manager.create_character(f"Bulk{i}", "Cleric") for i in range(10)]
+    saved, errors = character_manager.save_characters(chars, str(tmp_path), max_workers=4)
+    assert len(saved) == 10 and errors == {}
+
+    (tmp_path / "Broken_save.txt").write_text("QCSAVE 1 json\n{not json")
+    names = ["Bulk0", "Bulk9", "Missing", "Broken"]
+    loaded, errors = character_manager.load_characters(names, str(tmp_path), max_workers=4)
+
+    assert set(loaded) == {"Bulk0", "Bulk9"}
+    assert loaded["Bulk9"] == chars[9]
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+    assert isinstance(errors["Broken"], SaveFileCorruptedError)
+
+# ============================================================================
+# DELTA SAVE TESTS
+# ============================================================================
+
+def test_unchanged_character_is_not_rewritten(tmp_path):
+    """Test that saving a clean character skips the write"""
+    char = character_manager.create_character("Still", "Mage")
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.reset_save_stats()
+
+    assert character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Still", str(tmp_path))
+    assert character_manager.save_character(loaded, str(tmp_path))
+
+    stats = character_manager.save_stats()
+    assert (stats['saves'], stats['skipped'], stats['bytes_written']) == (2, 2, 0)
+
+def test_save_over_another_format_is_not_skipped(tmp_path):
+    """Test that a character saved in any format over another one is written"""
+    first = character_manager.create_character("Twin", "Mage")
+    character_manager.save_character(first, str(tmp_path), character_manager.SAVE_FORMAT_LEGACY)
+
+    second = character_manager.create_character("Twin", "Mage")
+    second['gold'] = 999
+    character_manager.save_character(second, str(tmp_path))
+
+    character_manager.save_character(first, str(tmp_path), character_manager.SAVE_FORMAT_LEGACY)
+    assert character_manager.load_character("Twin", str(tmp_path))['gold'] == first['gold']
+
+    # Same fields in a different format still rewrites the file
+    character_manager.reset_save_stats()
+    character_manager.save_character(first, str(tmp_path))
+    assert character_manager.save_stats()['skipped'] == 0
+
+def test_dirty_fields_track_in_place_changes(tmp_path):
+    """Test per-field dirty tracking, including list mutation"""
+    char = character_manager.create_character("Dirty", "Rogue")
+    character_manager.save_character(char, str(tmp_path))
+    assert char.dirty_fields() == ([], [])
+
+    char['gold'] += 10
+    char['inventory'].append('health_potion')
+    char['title'] = 'Thief'
+    assert sorted(char.dirty_fields()[0]) == ['gold', 'inventory', 'title']
+
+    del char['title']
+    character_manager.save_character(char, str(tmp_path))
+    del char['gold']
+    assert char.dirty_fields() == ([], ['gold'])
+
+def test_clean_state_keeps_no_copy_of_lists():
+    """Test that mark_clean fingerprints lists instead of copying them"""
+    char = character_manager.create_character("Light", "Cleric")
+    char['inventory'] = [f"item_{i}" for i in range(1000)]
+    char.mark_clean()
+
+    assert not any(isinstance(value, list) for value in char._saved.values())
+    char['inventory'][500] = 'swapped'
+    assert char.dirty_fields() == (['inventory'], [])
+
+def test_changes_with_equal_hashes_are_saved(tmp_path):
+    """Test that [-1] -> [-2] and 1 -> True count as changes (hash(-1) == hash(-2))"""
+    char = character_manager.create_character("Collide", "Mage")
+    char['inventory'] = [-1]
+    char['title'] = 1
+    character_manager.save_character(char, str(tmp_path))
+
+    char['inventory'][0] = -2
+    char['title'] = True
+    assert sorted(char.dirty_fields()[0]) == ['inventory', 'title']
+
+    character_manager.reset_save_stats()
+    character_manager.save_character(char, str(tmp_path))
+    assert character_manager.save_stats()['skipped'] == 0
+    loaded = character_manager.load_character("Collide", str(tmp_path))
+    assert loaded['inventory'] == [-2] and loaded['title'] is True
+
+def test_delta_save_writes_only_changed_fields(tmp_path):
+    """Test that a journaled save of a loaded character appends a small delta"""
+    char = character_manager.create_character("Delta", "Warrior")
+    char['inventory'] = [f"item_{i}" for i in range(200)]
+    character_manager.save_character(char, str(tmp_path))
+
+    loaded = character_manager.load_character("Delta", str(tmp_path))
+    loaded['gold'] = 7
+    character_manager.reset_save_stats()
+    character_manager.save_character(loaded, str(tmp_path), journal=True)
+
+    assert (tmp_path / "Delta_save.journal").read_text() == '{"gold":7}\n'
+    assert character_manager.save_stats()['last_save_bytes'] == len('{"gold":7}\n')
+    assert character_manager.load_character("Delta", str(tmp_path)) == loaded
+
+def test_save_after_delete_or_overwrite_is_written(tmp_path):
+    """Test that a clean character is rewritten once its save is gone or replaced"""
+    char = character_manager.create_character("Gone", "Cleric")
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.delete_character("Gone", str(tmp_path))
+
+    character_manager.save_character(char, str(tmp_path))
+    assert (tmp_path / "Gone_save.txt").exists()
+
+    other = character_manager.create_character("Gone", "Cleric")
+    other['gold'] = 1
+    character_manager.save_character(other, str(tmp_path))
+    character_manager.save_character(char, str(tmp_path))
+    assert character_manager.load_character("Gone", str(tmp_path))['gold'] == 100
+
+# ============================================================================
+# SAVE ARCHIVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_archive_cold_saves(tmp_path, codec):
+    """Test that old saves are packed, still listed and load on demand"""
+    old = character_manager.create_character("Old", "Mage")
+    old['inventory'] = ['health_potion'] * 50
+    character_manager.save_character(old, str(tmp_path))
+    character_manager.save_character(character_manager.create_character("New", "Rogue"), str(tmp_path))
+
+    year_ago = os.path.getmtime(tmp_path / "New_save.txt") - 365 * 86400
+    os.utime(tmp_path / "Old_save.txt", (year_ago, year_ago))
+
+    stats = character_manager.archive_characters(str(tmp_path), days=30, codec=codec)
+    assert stats['archived'] == 1
+    assert stats['reclaimed_bytes'] > 0
+    assert not (tmp_path / "Old_save.txt").exists()
+    assert (tmp_path / "New_save.txt").exists()
+
+    assert sorted(character_manager.list_saved_characters(str(tmp_path))) == ["New", "Old"]
+    assert character_manager.load_character("Old", str(tmp_path)) == old
+    assert character_manager.measure_cold_loads(str(tmp_path))['count'] == 1
+
+def test_archived_character_resave_and_delete(tmp_path):
+    """Test that saving revives an archived character and delete removes it"""
+    char = character_manager.create_character("Frost", "Warrior")
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.archive_characters(str(tmp_path), days=0, now=time.time() + 1)
+
+    char['gold'] = 999
+    character_manager.save_character(char, str(tmp_path))
+    assert character_manager.load_character("Frost", str(tmp_path))['gold'] == 999
+
+    character_manager.delete_character("Frost", str(tmp_path))
+    assert character_manager.list_saved_characters(str(tmp_path)) == []
+    assert os.listdir(tmp_path / "archive") == ["index.json"]
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Frost", str(tmp_path))